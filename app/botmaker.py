@@ -1,24 +1,41 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, Iterable, Iterator, Optional
+from contextlib import aclosing, suppress
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
 
-from .http import make_botmaker_client, HttpClient
+import httpx
+
+from .http import make_botmaker_client, AsyncHttpClient
 from .models import BotmakerChat, BotmakerMessage
 
 logger = logging.getLogger(__name__)
 
+_PAGES_DONE = object()
+
+
+def _query_params(*pairs: Tuple[str, Any]) -> Dict[str, Any]:
+    """Keep only the parameters that are set; booleans are sent as ``true``/``false``."""
+    return {
+        key: str(value).lower() if isinstance(value, bool) else value
+        for key, value in pairs
+        if isinstance(value, bool) or value
+    }
+
 
 class BotmakerClient:
-    def __init__(self, base_url: str, api_token: str, rps: float) -> None:
+    def __init__(
+        self, base_url: str, api_token: str, rps: float, client: Optional[httpx.AsyncClient] = None
+    ) -> None:
         if not api_token:
             raise ValueError("BOTMAKER_API_TOKEN is required")
-        self.http: HttpClient = make_botmaker_client(base_url, api_token, rps)
+        self.http: AsyncHttpClient = make_botmaker_client(base_url, api_token, rps, client)
 
-    def close(self) -> None:
-        self.http.close()
+    async def close(self) -> None:
+        await self.http.close()
 
-    def list_chats(
+    async def list_chats(
         self,
         *,
         from_iso: Optional[str] = None,
@@ -30,34 +47,26 @@ class BotmakerClient:
         long_term_search: bool = False,
         next_page: Optional[str] = None,
     ) -> Dict[str, Any]:
-        params: Dict[str, Any] = {}
-        if from_iso:
-            params["from"] = from_iso
-        if to_iso:
-            params["to"] = to_iso
-        if limit:
-            params["limit"] = limit
-        if channel_id:
-            params["channel-id"] = channel_id
-        if queue_id:
-            params["queue-id"] = queue_id
-        if has_agent is not None:
-            params["has-agent"] = str(has_agent).lower()
-        if long_term_search:
-            params["long-term-search"] = str(long_term_search).lower()
-
+        # nextPage links already carry the original query string.
+        params = None if next_page else _query_params(
+            ("from", from_iso),
+            ("to", to_iso),
+            ("limit", limit),
+            ("channel-id", channel_id),
+            ("queue-id", queue_id),
+            ("has-agent", has_agent),
+            ("long-term-search", long_term_search or None),
+        )
         url = next_page or "/chats"
-        resp = self.http.request("GET", url, params=params if next_page is None else None)
+        data = await self.http.request_json("GET", url, params=params)
         # Handle empty results (HTTP 204) gracefully
-        if resp.status_code == 204 or not resp.content:
+        if data is None:
             return {"items": [], "nextPage": None}
-        resp.raise_for_status()
-        data = resp.json()
         if not isinstance(data, dict):
             raise ValueError("Unexpected response structure for /chats")
         return data
 
-    def list_messages(
+    async def list_messages(
         self,
         *,
         from_iso: Optional[str] = None,
@@ -69,35 +78,70 @@ class BotmakerClient:
         long_term_search: bool = False,
         next_page: Optional[str] = None,
     ) -> Dict[str, Any]:
-        params: Dict[str, Any] = {}
-        if from_iso:
-            params["from"] = from_iso
-        if to_iso:
-            params["to"] = to_iso
-        if limit:
-            params["limit"] = limit
-        if channel_id:
-            params["channel-id"] = channel_id
-        if contact_id:
-            params["contact-id"] = contact_id
-        if chat_id:
-            params["chat-id"] = chat_id
-        if long_term_search:
-            params["long-term-search"] = str(long_term_search).lower()
-
+        params = None if next_page else _query_params(
+            ("from", from_iso),
+            ("to", to_iso),
+            ("limit", limit),
+            ("channel-id", channel_id),
+            ("contact-id", contact_id),
+            ("chat-id", chat_id),
+            ("long-term-search", long_term_search or None),
+        )
         url = next_page or "/messages"
-        resp = self.http.request("GET", url, params=params if next_page is None else None)
+        data = await self.http.request_json("GET", url, params=params)
         # Handle empty results (HTTP 204) gracefully
-        if resp.status_code == 204 or not resp.content:
+        if data is None:
             return {"items": [], "nextPage": None}
-        resp.raise_for_status()
-        data = resp.json()
         if not isinstance(data, dict):
             raise ValueError("Unexpected response structure for /messages")
         return data
 
 
-def stream_chats(
+async def prefetch_pages(
+    fetch_page: Callable[[Optional[str]], Awaitable[Dict[str, Any]]],
+    limit: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield pages in order while a background task already requests the next one.
+
+    The queue holds one page and the producer fetches at most one more while it is full, so
+    no more than two pages are ever read ahead of the consumer.
+    Once the pages fetched so far hold ``limit`` items no further page is requested, since
+    the consumer would stop before reading it.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+    async def producer() -> None:
+        next_page: Optional[str] = None
+        fetched = 0
+        try:
+            while True:
+                page = await fetch_page(next_page)
+                await queue.put(page)
+                fetched += len(page.get("items") or ())
+                next_page = page.get("nextPage")
+                if not next_page or (limit and fetched >= limit):
+                    break
+        except Exception as exc:  # handed to the consumer, which re-raises it
+            await queue.put(exc)
+            return
+        await queue.put(_PAGES_DONE)
+
+    task = asyncio.create_task(producer())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _PAGES_DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+
+async def stream_chats(
     client: BotmakerClient,
     *,
     from_iso: Optional[str] = None,
@@ -107,11 +151,9 @@ def stream_chats(
     queue_id: Optional[str] = None,
     has_agent: Optional[bool] = None,
     long_term_search: bool = False,
-) -> Iterator[BotmakerChat]:
-    next_page: Optional[str] = None
-    total = 0
-    while True:
-        page = client.list_chats(
+) -> AsyncIterator[BotmakerChat]:
+    def fetch_page(next_page: Optional[str]) -> Awaitable[Dict[str, Any]]:
+        return client.list_chats(
             from_iso=from_iso,
             to_iso=to_iso,
             limit=limit,
@@ -121,19 +163,19 @@ def stream_chats(
             long_term_search=long_term_search,
             next_page=next_page,
         )
-        items = page.get("items", [])
-        for item in items:
-            yield BotmakerChat.from_api(item)
-            total += 1
-            if limit and total >= limit:
-                return
-        next_page = page.get("nextPage")
-        if not next_page:
-            break
+
+    total = 0
+    async with aclosing(prefetch_pages(fetch_page, limit)) as pages:
+        async for page in pages:
+            for item in page.get("items", []):
+                yield BotmakerChat.from_api(item)
+                total += 1
+                if limit and total >= limit:
+                    return
     logger.info("Fetched %d chats", total)
 
 
-def stream_messages(
+async def stream_messages(
     client: BotmakerClient,
     *,
     from_iso: Optional[str] = None,
@@ -143,11 +185,9 @@ def stream_messages(
     contact_id: Optional[str] = None,
     chat_id: Optional[str] = None,
     long_term_search: bool = False,
-) -> Iterator[BotmakerMessage]:
-    next_page: Optional[str] = None
-    total = 0
-    while True:
-        page = client.list_messages(
+) -> AsyncIterator[BotmakerMessage]:
+    def fetch_page(next_page: Optional[str]) -> Awaitable[Dict[str, Any]]:
+        return client.list_messages(
             from_iso=from_iso,
             to_iso=to_iso,
             limit=limit,
@@ -157,13 +197,13 @@ def stream_messages(
             long_term_search=long_term_search,
             next_page=next_page,
         )
-        items = page.get("items", [])
-        for item in items:
-            yield BotmakerMessage.from_api(item)
-            total += 1
-            if limit and total >= limit:
-                return
-        next_page = page.get("nextPage")
-        if not next_page:
-            break
+
+    total = 0
+    async with aclosing(prefetch_pages(fetch_page, limit)) as pages:
+        async for page in pages:
+            for item in page.get("items", []):
+                yield BotmakerMessage.from_api(item)
+                total += 1
+                if limit and total >= limit:
+                    return
     logger.info("Fetched %d messages", total)
@@ -1,97 +1,136 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
-from .http import HttpClient, make_chatwoot_client
+import httpx
+
+from .http import AsyncHttpClient, make_chatwoot_client
 
 logger = logging.getLogger(__name__)
 
+SEARCH_CACHE_SIZE = 4096
+SEARCH_CACHE_TTL = 300.0
+# Payload fields a contact can be searched by; a write only invalidates searches for these values.
+_SEARCHABLE_CONTACT_FIELDS = ("identifier", "email", "phone_number", "name")
+
 
 class ChatwootClient:
-    def __init__(self, base_url: str, api_access_token: str, rps: float) -> None:
+    def __init__(
+        self, base_url: str, api_access_token: str, rps: float, client: Optional[httpx.AsyncClient] = None
+    ) -> None:
         if not api_access_token:
             raise ValueError("CHATWOOT_API_ACCESS_TOKEN is required")
-        self.http: HttpClient = make_chatwoot_client(base_url, api_access_token, rps)
+        self.http: AsyncHttpClient = make_chatwoot_client(base_url, api_access_token, rps, client)
+        # Lookups repeat a lot during an import; keep them in memory instead of paying an RTT each time.
+        self._inboxes_cache: Dict[str, Dict[str, Any]] = {}
+        self._search_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    async def __aenter__(self) -> "ChatwootClient":
+        return self
 
-    def close(self) -> None:
-        self.http.close()
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
 
-    def create_contact(self, account_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def close(self) -> None:
+        await self.http.close()
+
+    async def create_contact(self, account_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         url = f"/api/v1/accounts/{account_id}/contacts"
-        resp = self.http.request("POST", url, json=payload)
-        resp.raise_for_status()
-        return resp.json()
+        try:
+            return await self.http.request_json("POST", url, json=payload)
+        finally:
+            self._invalidate_payload(account_id, payload)
 
-    def update_contact(self, account_id: str, contact_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def update_contact(self, account_id: str, contact_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
         url = f"/api/v1/accounts/{account_id}/contacts/{contact_id}"
-        resp = self.http.request("PUT", url, json=payload)
-        resp.raise_for_status()
-        return resp.json()
-
-    def list_contacts(self, account_id: str, **params: Any) -> Dict[str, Any]:
+        try:
+            return await self.http.request_json("PUT", url, json=payload)
+        finally:
+            self._invalidate_payload(account_id, payload)
+
+    def invalidate_contact(self, account_id: str, identifier: Optional[str] = None) -> None:
+        """Drop cached searches for ``identifier`` (or every search of the account when omitted)."""
+        if identifier is not None:
+            self._search_cache.pop((account_id, identifier), None)
+            return
+        for key in [k for k in self._search_cache if k[0] == account_id]:
+            del self._search_cache[key]
+
+    def _invalidate_payload(self, account_id: str, payload: Dict[str, Any]) -> None:
+        # Called once the write returned: a search finishing while it was in flight could
+        # otherwise cache the pre-write result again.
+        for field in _SEARCHABLE_CONTACT_FIELDS:
+            value = payload.get(field)
+            if value:
+                self.invalidate_contact(account_id, str(value))
+
+    async def list_contacts(self, account_id: str, **params: Any) -> Dict[str, Any]:
         """Raw list contacts with optional filters (best-effort; Chatwoot may ignore unknown params)."""
         url = f"/api/v1/accounts/{account_id}/contacts"
-        resp = self.http.request("GET", url, params=params or None)
-        resp.raise_for_status()
-        return resp.json()
+        return await self.http.request_json("GET", url, params=params or None)
 
-    def create_conversation(self, account_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_conversation(self, account_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         url = f"/api/v1/accounts/{account_id}/conversations"
-        resp = self.http.request("POST", url, json=payload)
-        resp.raise_for_status()
-        return resp.json()
+        return await self.http.request_json("POST", url, json=payload)
 
-    def update_conversation(self, account_id: str, conversation_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def update_conversation(self, account_id: str, conversation_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
         url = f"/api/v1/accounts/{account_id}/conversations/{conversation_id}"
-        resp = self.http.request("PATCH", url, json=payload)
-        resp.raise_for_status()
-        return resp.json()
+        return await self.http.request_json("PATCH", url, json=payload)
 
-    def add_conversation_labels(self, account_id: str, conversation_id: int, labels: List[str]) -> Dict[str, Any]:
+    async def add_conversation_labels(self, account_id: str, conversation_id: int, labels: List[str]) -> Dict[str, Any]:
         url = f"/api/v1/accounts/{account_id}/conversations/{conversation_id}/labels"
-        resp = self.http.request("POST", url, json={"labels": labels})
-        resp.raise_for_status()
-        return resp.json()
+        return await self.http.request_json("POST", url, json={"labels": labels})
 
-    def create_message(self, account_id: str, conversation_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_message(self, account_id: str, conversation_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
         url = f"/api/v1/accounts/{account_id}/conversations/{conversation_id}/messages"
-        resp = self.http.request("POST", url, json=payload)
-        resp.raise_for_status()
-        return resp.json()
+        return await self.http.request_json("POST", url, json=payload)
 
-    def create_conversation_note(self, account_id: str, conversation_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_conversation_note(self, account_id: str, conversation_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
         url = f"/api/v1/accounts/{account_id}/conversations/{conversation_id}/notes"
-        resp = self.http.request("POST", url, json=payload)
-        resp.raise_for_status()
-        return resp.json()
+        return await self.http.request_json("POST", url, json=payload)
 
-    def list_inboxes(self, account_id: str) -> Dict[str, Any]:
+    async def list_inboxes(self, account_id: str) -> Dict[str, Any]:
+        """List inboxes of an account; cached for the lifetime of the client."""
+        cached = self._inboxes_cache.get(account_id)
+        if cached is not None:
+            return cached
         url = f"/api/v1/accounts/{account_id}/inboxes"
-        resp = self.http.request("GET", url)
-        resp.raise_for_status()
-        return resp.json()
+        data = await self.http.request_json("GET", url)
+        self._inboxes_cache[account_id] = data
+        return data
 
-    def search_contacts(self, account_id: str, query: str) -> Dict[str, Any]:
+    async def search_contacts(self, account_id: str, query: str) -> Dict[str, Any]:
         """Search contacts by a free-text query (identifier, email, phone, name).
-        Chatwoot supports a search endpoint under contacts.
+        Chatwoot supports a search endpoint under contacts. Results are cached per
+        ``(account_id, query)`` for ``SEARCH_CACHE_TTL`` seconds; contact writes invalidate them.
         """
+        key = (account_id, query)
+        now = time.monotonic()
+        hit = self._search_cache.get(key)
+        if hit is not None and hit[0] > now:
+            self._search_cache.move_to_end(key)
+            return hit[1]
+        data = await self._search_contacts_uncached(account_id, query)
+        self._search_cache[key] = (now + SEARCH_CACHE_TTL, data)
+        self._search_cache.move_to_end(key)
+        if len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return data
+
+    async def _search_contacts_uncached(self, account_id: str, query: str) -> Dict[str, Any]:
         url = f"/api/v1/accounts/{account_id}/contacts/search"
         params = {"q": query}
-        resp = self.http.request("GET", url, params=params)
-        resp.raise_for_status()
-        return resp.json()
+        return await self.http.request_json("GET", url, params=params)
 
-    def create_contact_inbox(self, account_id: str, contact_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_contact_inbox(self, account_id: str, contact_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Associate a contact with an inbox and a source_id (API channel)"""
         url = f"/api/v1/accounts/{account_id}/contacts/{contact_id}/contact_inboxes"
-        resp = self.http.request("POST", url, json=payload)
-        resp.raise_for_status()
-        return resp.json()
+        return await self.http.request_json("POST", url, json=payload)
 
-    def create_contact_note(self, account_id: str, contact_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_contact_note(self, account_id: str, contact_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Create a note on a contact (content in payload['content'])."""
         url = f"/api/v1/accounts/{account_id}/contacts/{contact_id}/notes"
-        resp = self.http.request("POST", url, json=payload)
-        resp.raise_for_status()
-        return resp.json()
+        return await self.http.request_json("POST", url, json=payload)
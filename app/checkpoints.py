@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-import json
 import os
+import threading
 from typing import Any, Dict, Optional
 
+from .utils import json_dumps, json_loads
+
 
 class CheckpointStore:
-    """Persist checkpoints as JSON document in mappings directory."""
+    """Persist checkpoints as JSON document in mappings directory.
+
+    The document is read once and kept in memory; mutations only mark the store
+    dirty and are written by ``flush()`` (also called when used as a context manager).
+    One store may be shared by threads (parallel extraction windows): mutations and
+    writes are serialized by a lock.
+    """
 
     def __init__(self, directory: str, filename: str = "checkpoints.json") -> None:
         self.directory = directory
@@ -14,28 +22,58 @@ class CheckpointStore:
         os.makedirs(self.directory, exist_ok=True)
         if not os.path.exists(self.path):
             self._write({})
+        self._data: Dict[str, Any] = self._read()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "CheckpointStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
 
     def _read(self) -> Dict[str, Any]:
-        with open(self.path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(self.path, "rb") as f:
+            return json_loads(f.read())
 
     def _write(self, data: Dict[str, Any]) -> None:
-        tmp_path = f"{self.path}.tmp"
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Per-process temp name: separate extraction processes may share the mappings directory.
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json_dumps(data, indent=True))
         os.replace(tmp_path, self.path)
 
     def get(self, key: str, default: Optional[Any] = None) -> Any:
-        data = self._read()
-        return data.get(key, default)
+        return self._data.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
-        data = self._read()
-        data[key] = value
-        self._write(data)
+        with self._lock:
+            self._data[key] = value
+            self._dirty = True
+
+    def set_latest(self, key: str, value: Dict[str, Any], order_by: str) -> None:
+        """Set ``key`` unless the stored value is later by ``order_by`` (e.g. a window's "to")."""
+        with self._lock:
+            current = self._data.get(key)
+            if isinstance(current, dict) and (current.get(order_by) or "") > (value.get(order_by) or ""):
+                return
+            self._data[key] = value
+            self._dirty = True
+
+    def update(self, values: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data.update(values)
+            self._dirty = True
 
     def delete(self, key: str) -> None:
-        data = self._read()
-        if key in data:
-            del data[key]
-            self._write(data)
+        with self._lock:
+            if key in self._data:
+                del self._data[key]
+                self._dirty = True
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self._write(self._data)
+            self._dirty = False
@@ -36,6 +36,8 @@ class Settings:
     rate_limit_rps: float = float(os.getenv("RATE_LIMIT_RPS", "4"))
     page_size: int = int(os.getenv("PAGE_SIZE", "100"))
     chunk_size: int = int(os.getenv("CHUNK_SIZE", "200"))
+    extract_concurrency: int = int(os.getenv("EXTRACT_CONCURRENCY", "8"))
+    load_concurrency: int = int(os.getenv("LOAD_CONCURRENCY", "8"))
 
     # Extraction window
     extract_start: str | None = os.getenv("EXTRACT_START")
@@ -1,22 +1,27 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
-from dataclasses import asdict
+from contextlib import aclosing
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+import httpx
 
 from .botmaker import BotmakerClient, stream_chats, stream_messages
 from .checkpoints import CheckpointStore
 from .config import Settings, get_settings
+from .http import make_shared_async_client
 from .logging_setup import setup_logging
+from .models import BotmakerChat
 from .storage import make_storage
 
 logger = logging.getLogger(__name__)
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Extract chats, contacts and messages from Botmaker")
     parser.add_argument("--from", dest="from_iso", help="Start datetime ISO-8601")
     parser.add_argument("--to", dest="to_iso", help="End datetime ISO-8601")
@@ -35,7 +40,7 @@ def parse_args() -> argparse.Namespace:
         help="Optional prefix under data directory. Defaults to botmaker/run-<timestamp>",
     )
     parser.add_argument("--reset-checkpoints", action="store_true", help="Ignore stored checkpoints")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def default_window(settings, args) -> tuple[str, str]:
@@ -50,7 +55,8 @@ def default_window(settings, args) -> tuple[str, str]:
     return default_start, default_end
 
 
-def build_contact_record(chat_dict: Dict) -> Dict:
+def build_contact_record(chat_dict: Dict, inserted_at: str) -> Dict:
+    """Contact record for the first chat seen of a contact; ``inserted_at`` is the run's start time."""
     return {
         "contact_id": chat_dict.get("contact_id"),
         "channel_id": chat_dict.get("channel_id"),
@@ -62,7 +68,7 @@ def build_contact_record(chat_dict: Dict) -> Dict:
         "external_id": chat_dict.get("external_id"),
         "variables": chat_dict.get("variables"),
         "tags": chat_dict.get("tags"),
-        "inserted_at": datetime.now(timezone.utc).isoformat(),
+        "inserted_at": inserted_at,
         "exported_to_chatwoot": False,
         "exported_at": None,
     }
@@ -75,9 +81,37 @@ def run_sample_extract(
     messages_per_chat: Optional[int] = 1,
     skip_messages: bool = False,
     long_term: bool = False,
+    client: Optional[httpx.AsyncClient] = None,
+    runner: Optional[asyncio.Runner] = None,
 ) -> Dict[str, object]:
-    """Execute uma extração em memória limitada para uso em testes/web."""
+    """Execute uma extração em memória limitada para uso em testes/web.
+
+    ``client`` é um pool HTTP reaproveitado entre chamadas; como as conexões ficam presas ao event
+    loop em que foram abertas, ele deve vir acompanhado do ``runner`` que mantém esse loop vivo.
+    """
+
+    extraction = _sample_extract(
+        settings=settings,
+        max_chats=max_chats,
+        messages_per_chat=messages_per_chat,
+        skip_messages=skip_messages,
+        long_term=long_term,
+        http_client=client,
+    )
+    if runner is not None:
+        return runner.run(extraction)
+    return asyncio.run(extraction)
 
+
+async def _sample_extract(
+    *,
+    settings: Optional[Settings],
+    max_chats: int,
+    messages_per_chat: Optional[int],
+    skip_messages: bool,
+    long_term: bool,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> Dict[str, object]:
     resolved_settings = settings or get_settings()
     args_like = SimpleNamespace(from_iso=None, to_iso=None)
     from_iso, to_iso = default_window(resolved_settings, args_like)
@@ -86,46 +120,50 @@ def run_sample_extract(
         resolved_settings.botmaker_base_url,
         resolved_settings.botmaker_api_token,
         resolved_settings.rate_limit_rps,
+        client=http_client,
     )
 
     contacts: Dict[str, Dict] = {}
     chats_output: List[Dict] = []
     messages_output: List[Dict] = []
+    inserted_at = datetime.now(timezone.utc).isoformat()
+    semaphore = asyncio.Semaphore(resolved_settings.extract_concurrency)
 
     try:
-        for chat in stream_chats(
-            client,
-            from_iso=from_iso,
-            to_iso=to_iso,
-            limit=max_chats,
-            long_term_search=long_term,
-        ):
-            chat_dict = asdict(chat)
-            chats_output.append(chat_dict)
-
-            contact_id = chat_dict.get("contact_id")
-            if contact_id and contact_id not in contacts:
-                contacts[contact_id] = build_contact_record(chat_dict)
-
-            if skip_messages:
-                continue
-
-            fetched = 0
-            for message in stream_messages(
+        # Messages of each chat are fetched as soon as the chat arrives, overlapping with the
+        # remaining chat pages instead of waiting for the whole listing.
+        async with asyncio.TaskGroup() as tg, aclosing(
+            stream_chats(
                 client,
                 from_iso=from_iso,
                 to_iso=to_iso,
-                chat_id=chat.chat_id,
-                channel_id=chat.channel_id,
-                contact_id=chat.contact_id,
-                limit=messages_per_chat,
+                limit=max_chats,
                 long_term_search=long_term,
-            ):
-                msg_dict = asdict(message)
-                messages_output.append(msg_dict)
-                fetched += 1
-                if messages_per_chat and fetched >= messages_per_chat:
-                    break
+            )
+        ) as chat_stream:
+            async for chat in chat_stream:
+                chat_dict = chat.to_dict()
+                chats_output.append(chat_dict)
+
+                # Most chats belong to an already-seen contact: one lookup, record built only on a miss.
+                contact_id = chat.contact_id
+                if contact_id and contacts.get(contact_id) is None:
+                    contacts[contact_id] = build_contact_record(chat_dict, inserted_at)
+
+                if not skip_messages:
+                    await semaphore.acquire()
+                    tg.create_task(
+                        fetch_chat_messages(
+                            client,
+                            chat,
+                            semaphore,
+                            messages_output.append,
+                            from_iso=from_iso,
+                            to_iso=to_iso,
+                            limit=messages_per_chat,
+                            long_term=long_term,
+                        )
+                    )
 
         summary = {
             "type": "extract_sample",
@@ -150,19 +188,66 @@ def run_sample_extract(
             "chats": chats_output,
             "messages": messages_output,
         }
+    except ExceptionGroup as group:
+        # Callers (the Netlify handler) branch on the type of the first underlying error.
+        raise group.exceptions[0]
     finally:
-        client.close()
+        await client.close()
 
 
-def main() -> None:
-    args = parse_args()
+async def fetch_chat_messages(
+    client: BotmakerClient,
+    chat: BotmakerChat,
+    semaphore: asyncio.Semaphore,
+    emit: Callable[[Dict], None],
+    *,
+    from_iso: str,
+    to_iso: str,
+    limit: Optional[int],
+    long_term: bool,
+) -> int:
+    """Stream the messages of a single chat into ``emit`` and return how many were emitted.
+
+    ``semaphore`` caps how many chats are paged at once. The caller acquires it before
+    scheduling this coroutine, so it stops pulling chats while the cap is reached; it is
+    released here once the chat is done.
+    """
+    count = 0
+    try:
+        async for message in stream_messages(
+            client,
+            from_iso=from_iso,
+            to_iso=to_iso,
+            chat_id=chat.chat_id,
+            channel_id=chat.channel_id,
+            contact_id=chat.contact_id,
+            limit=limit,
+            long_term_search=long_term,
+        ):
+            emit(message.to_dict())
+            count += 1
+    finally:
+        semaphore.release()
+    return count
+
+
+async def run_extract(
+    args: argparse.Namespace,
+    rps: Optional[float] = None,
+    configure_logging: bool = True,
+    checkpoints: Optional[CheckpointStore] = None,
+) -> None:
     settings = get_settings()
 
-    setup_logging(settings.log_dir)
+    if configure_logging:
+        setup_logging(settings.log_dir)
     logger.info("Starting Botmaker extraction")
 
     storage = make_storage(settings.storage_backend, settings.data_dir)
-    checkpoints = CheckpointStore(settings.mappings_dir)
+    # A store passed in is shared with other windows and flushed by its owner.
+    owns_checkpoints = checkpoints is None
+    if checkpoints is None:
+        checkpoints = CheckpointStore(settings.mappings_dir)
 
     from_iso, to_iso = default_window(settings, args)
     if args.reset_checkpoints:
@@ -179,65 +264,112 @@ def main() -> None:
         "long_term_search": args.long_term,
     }
 
+    # One pool for the whole run, injected so other API wrappers can share it.
+    http_client = make_shared_async_client()
     client = BotmakerClient(
         settings.botmaker_base_url,
         settings.botmaker_api_token,
-        settings.rate_limit_rps,
+        rps if rps is not None else settings.rate_limit_rps,
+        client=http_client,
     )
 
-    contacts: Dict[str, Dict] = {}
-    chats_output: List[Dict] = []
-    messages_output: List[Dict] = []
-
-    try:
-        for chat in stream_chats(
-            client,
-            from_iso=from_iso,
-            to_iso=to_iso,
-            limit=args.max_chats,
-            long_term_search=args.long_term,
-        ):
-            chat_dict = asdict(chat)
-            chats_output.append(chat_dict)
-
-            contact_id = chat_dict.get("contact_id")
-            if contact_id and contact_id not in contacts:
-                contacts[contact_id] = build_contact_record(chat_dict)
-
-            if args.skip_messages:
-                continue
-
-            per_chat_limit = args.messages_per_chat
-            count = 0
-            for message in stream_messages(
+    # Records are streamed to disk as they are produced and counted by their writers; for
+    # contacts only the seen ids are kept, since a contact's record is fixed at first sight.
+    seen_contacts: Set[str] = set()
+    inserted_at = datetime.now(timezone.utc).isoformat()
+    messages_count = 0
+    contacts_writer = storage.open_ndjson(f"{prefix}/contacts.ndjson")
+    chats_writer = storage.open_ndjson(f"{prefix}/chats.ndjson")
+    messages_writer = None if args.skip_messages else storage.open_ndjson(f"{prefix}/messages.ndjson")
+
+    # Fetch, transform and write run as separate stages linked by bounded queues, so encoding
+    # and disk writes overlap with waiting on Botmaker while the queues provide backpressure.
+    raw_chats: "asyncio.Queue[Optional[BotmakerChat]]" = asyncio.Queue(maxsize=settings.chunk_size)
+    chat_dicts: "asyncio.Queue[Optional[Dict]]" = asyncio.Queue(maxsize=settings.chunk_size)
+    semaphore = asyncio.Semaphore(settings.extract_concurrency)
+
+    async def fetch_chats() -> None:
+        async with aclosing(
+            stream_chats(
                 client,
                 from_iso=from_iso,
                 to_iso=to_iso,
-                chat_id=chat.chat_id,
-                channel_id=chat.channel_id,
-                contact_id=chat.contact_id,
+                limit=args.max_chats,
                 long_term_search=args.long_term,
-            ):
-                msg_dict = asdict(message)
-                messages_output.append(msg_dict)
-                count += 1
-                if per_chat_limit and count >= per_chat_limit:
-                    break
-
-        storage.write_ndjson(f"{prefix}/chats.ndjson", chats_output)
-        storage.write_ndjson(f"{prefix}/contacts.ndjson", contacts.values())
-        if not args.skip_messages:
-            storage.write_ndjson(f"{prefix}/messages.ndjson", messages_output)
+            )
+        ) as chats:
+            async for chat in chats:
+                await raw_chats.put(chat)
+        await raw_chats.put(None)
+
+    async def transform_chats(tg: asyncio.TaskGroup) -> None:
+        while True:
+            chat = await raw_chats.get()
+            if chat is None:
+                break
+            chat_dict = chat.to_dict()
+
+            # Most chats belong to an already-seen contact: one lookup, record built only on a miss.
+            contact_id = chat.contact_id
+            if contact_id and contact_id not in seen_contacts:
+                seen_contacts.add(contact_id)
+                contacts_writer.write(build_contact_record(chat_dict, inserted_at))
+
+            if messages_writer is not None:
+                # Chats are independent, so their messages are paged concurrently as chats arrive.
+                # Waiting for a slot here stalls this stage, so the bounded queues push back on
+                # the chat listing instead of piling up pending tasks.
+                await semaphore.acquire()
+                tg.create_task(
+                    fetch_chat_messages(
+                        client,
+                        chat,
+                        semaphore,
+                        messages_writer.write,
+                        from_iso=from_iso,
+                        to_iso=to_iso,
+                        limit=args.messages_per_chat,
+                        long_term=args.long_term,
+                    )
+                )
+            await chat_dicts.put(chat_dict)
+        await chat_dicts.put(None)
+
+    async def write_chats() -> None:
+        while True:
+            chat_dict = await chat_dicts.get()
+            if chat_dict is None:
+                break
+            chats_writer.write(chat_dict)
+        chats_writer.close()
+
+    try:
+        # The task group cancels the remaining stages as soon as one of them fails.
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(fetch_chats())
+            tg.create_task(transform_chats(tg))
+            tg.create_task(write_chats())
+
+        contacts_writer.close()
+        chats_count = chats_writer.count
+        contacts_count = contacts_writer.count
+        if messages_writer is not None:
+            messages_writer.close()
+            messages_count = messages_writer.count
 
         export_meta.update(
             {
-                "chats_exported": len(chats_output),
-                "contacts_exported": len(contacts),
-                "messages_exported": len(messages_output),
+                "chats_exported": chats_count,
+                "contacts_exported": contacts_count,
+                "messages_exported": messages_count,
                 "output_prefix": prefix,
             }
         )
-        checkpoints.set("last_extract", export_meta)
+        if owns_checkpoints:
+            checkpoints.set("last_extract", export_meta)
+        else:
+            # Parallel windows finish in any order; the latest window is kept, as in a serial run.
+            checkpoints.set_latest("last_extract", export_meta, "to")
         # Write extraction summary for web frontend
         summary = {
             "type": "extract",
@@ -245,9 +377,9 @@ def main() -> None:
             "prefix": prefix,
             "window": {"from": from_iso, "to": to_iso},
             "counts": {
-                "contacts": len(contacts),
-                "chats": len(chats_output),
-                "messages": len(messages_output),
+                "contacts": contacts_count,
+                "chats": chats_count,
+                "messages": messages_count,
             },
             "files": {
                 "contacts": "contacts.ndjson",
@@ -259,15 +391,52 @@ def main() -> None:
         logger.info(
             "Extraction finished",
             extra={
-                "chats": len(chats_output),
-                "contacts": len(contacts),
-                "messages": len(messages_output),
+                "chats": chats_count,
+                "contacts": contacts_count,
+                "messages": messages_count,
                 "prefix": prefix,
             },
         )
 
     finally:
-        client.close()
+        contacts_writer.close()
+        chats_writer.close()
+        if messages_writer is not None:
+            messages_writer.close()
+        if owns_checkpoints:
+            checkpoints.flush()
+        await client.close()
+        await http_client.aclose()
+
+
+def run(
+    from_iso: str,
+    to_iso: str,
+    long_term: bool = False,
+    output_prefix: Optional[str] = None,
+    rps: Optional[float] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+) -> int:
+    """Run one extraction window in-process, returning an exit code (0 on success).
+
+    Logging is left to the caller, which configures it once for all windows; a shared
+    ``checkpoints`` store is likewise flushed by the caller.
+    """
+    argv = ["--from", from_iso, "--to", to_iso]
+    if long_term:
+        argv.append("--long-term")
+    if output_prefix:
+        argv += ["--output-prefix", output_prefix]
+    try:
+        asyncio.run(run_extract(parse_args(argv), rps=rps, configure_logging=False, checkpoints=checkpoints))
+    except Exception:
+        logger.exception("Extraction failed", extra={"from": from_iso, "to": to_iso, "prefix": output_prefix})
+        return 1
+    return 0
+
+
+def main() -> None:
+    asyncio.run(run_extract(parse_args()))
 
 
 if __name__ == "__main__":
@@ -1,69 +1,173 @@
+import asyncio
+import random
 import time
 import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Optional, Dict, Any
 
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+
+from .utils import json_loads
 
 logger = logging.getLogger(__name__)
 
+# Keep warm connections around between bursts; HTTP/2 multiplexes concurrent requests per connection.
+DEFAULT_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=128, keepalive_expiry=60.0)
+DEFAULT_TIMEOUT = httpx.Timeout(connect=5.0, read=30.0, write=15.0, pool=5.0)
+
+MAX_ATTEMPTS = 5
+RETRY_STATUSES = (429, 500, 502, 503)
+# Upper bound for server-provided Retry-After so a bogus header cannot stall a run indefinitely.
+MAX_RETRY_AFTER = 120.0
+
+
+def _retry_after_seconds(resp: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header given either as delta-seconds or as an HTTP-date."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def _backoff_seconds(attempt: int) -> float:
+    # ``attempt`` counts from 1, so the delays run 0.5, 1, 2, 4s like the former tenacity policy.
+    return min(10.0, 0.5 * 2 ** (attempt - 1)) + random.random() * 0.25
+
+
+class AsyncRateLimiter:
+    """Token bucket that allows bursts of up to ``rps`` requests and refills at ``rps`` tokens/s.
+
+    The bucket is kept as integer nanoseconds of credit against ``time.monotonic_ns()``, so the
+    bookkeeping is immune to wall-clock jumps and avoids float accumulation.
+    """
 
-class RateLimiter:
     def __init__(self, rps: float):
-        self.min_interval = 1.0 / max(rps, 0.1)
-        self._last = 0.0
+        rate = max(rps, 0.1)
+        self._interval_ns = int(1e9 / rate)
+        self._capacity_ns = int(max(rate, 1.0) * self._interval_ns)
+        self._credit_ns = self._capacity_ns
+        self._last_ns = time.monotonic_ns()
+        # asyncio.Lock wakes waiters in FIFO order, so requests are served fairly.
+        self._lock = asyncio.Lock()
 
-    def wait(self):
-        now = time.time()
-        elapsed = now - self._last
-        sleep_for = self.min_interval - elapsed
-        if sleep_for > 0:
-            time.sleep(sleep_for)
-        self._last = time.time()
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic_ns()
+                self._credit_ns = min(self._capacity_ns, self._credit_ns + now - self._last_ns)
+                self._last_ns = now
+                if self._credit_ns >= self._interval_ns:
+                    self._credit_ns -= self._interval_ns
+                    return
+                await asyncio.sleep((self._interval_ns - self._credit_ns) / 1e9)
 
 
-class HttpClient:
-    def __init__(self, base_url: str, headers: Optional[Dict[str, str]] = None, rps: float = 4.0, timeout: float = 30.0):
+class AsyncHttpClient:
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        rps: float = 4.0,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
         self.base_url = base_url.rstrip("/")
-        self.headers = headers or {}
-        self.limiter = RateLimiter(rps)
-        self.client = httpx.Client(base_url=self.base_url, headers=self.headers, timeout=timeout)
-
-    def close(self):
-        self.client.close()
-
-    @retry(
-        reraise=True,
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=0.5, min=0.5, max=10),
-        retry=retry_if_exception_type(httpx.HTTPError),
-    )
-    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
-        self.limiter.wait()
-        try:
-            resp = self.client.request(method, url, **kwargs)
-            if resp.status_code in (429, 503, 502, 500):
-                # surface as error to trigger retry
+        # Normalised once; httpx would otherwise rebuild it from the plain dict on every merge.
+        self.headers = httpx.Headers(headers)
+        self.limiter = AsyncRateLimiter(rps)
+        # An injected client is shared with other API wrappers and owned by the caller: requests
+        # then carry their own absolute URL and headers, and close() leaves the pool open.
+        self._owns_client = client is None
+        if client is None:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=timeout,
+                limits=limits,
+                http2=True,
+            )
+        self.client = client
+
+    async def close(self):
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if not self._owns_client:
+            if not url.startswith(("http://", "https://")):
+                url = f"{self.base_url}{url}"
+            kwargs.setdefault("headers", self.headers)
+        # The request (URL, merged headers, encoded body) is built once and re-sent on retries.
+        request = self.client.build_request(method, url, **kwargs)
+        # Retries reuse the token acquired here so backoff is not stacked on top of the rate limit.
+        await self.limiter.acquire()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                resp = await self.client.send(request)
+            except httpx.HTTPError as e:
+                logger.warning("HTTP error on %s %s (attempt %d/%d): %s", method, url, attempt, MAX_ATTEMPTS, e)
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                await asyncio.sleep(_backoff_seconds(attempt))
+                continue
+
+            if resp.status_code not in RETRY_STATUSES:
+                return resp
+            logger.warning(
+                "HTTP %s on %s %s (attempt %d/%d)", resp.status_code, method, url, attempt, MAX_ATTEMPTS
+            )
+            if attempt == MAX_ATTEMPTS:
                 raise httpx.HTTPStatusError("server backoff", request=resp.request, response=resp)
-            return resp
-        except httpx.HTTPError as e:
-            logger.warning("HTTP error on %s %s: %s", method, url, e)
-            raise
+            delay = _retry_after_seconds(resp) if resp.status_code in (429, 503) else None
+            await asyncio.sleep(delay if delay is not None else _backoff_seconds(attempt))
+
+    async def request_json(self, method: str, url: str, **kwargs) -> Any:
+        """Perform a request, raise on error statuses and decode the body once (``None`` when empty)."""
+        resp = await self.request(method, url, **kwargs)
+        resp.raise_for_status()
+        if resp.status_code == 204 or not resp.content:
+            return None
+        return json_loads(resp.content)
+
+
+def make_shared_async_client(
+    timeout: httpx.Timeout = DEFAULT_TIMEOUT, limits: httpx.Limits = DEFAULT_LIMITS
+) -> httpx.AsyncClient:
+    """One connection pool to inject into several API wrappers; the caller closes it."""
+    return httpx.AsyncClient(timeout=timeout, limits=limits, http2=True)
 
 
-def make_botmaker_client(base_url: str, token: str, rps: float) -> HttpClient:
+def make_botmaker_client(
+    base_url: str, token: str, rps: float, client: Optional[httpx.AsyncClient] = None
+) -> AsyncHttpClient:
     headers = {
         "access-token": token,
         "Content-Type": "application/json",
         "Accept": "application/json",
     }
-    return HttpClient(base_url, headers=headers, rps=rps)
+    return AsyncHttpClient(base_url, headers=headers, rps=rps, client=client)
 
 
-def make_chatwoot_client(base_url: str, api_access_token: str, rps: float) -> HttpClient:
+def make_chatwoot_client(
+    base_url: str, api_access_token: str, rps: float, client: Optional[httpx.AsyncClient] = None
+) -> AsyncHttpClient:
     headers = {
         "api_access_token": api_access_token,
         "Content-Type": "application/json",
         "Accept": "application/json",
     }
-    return HttpClient(base_url, headers=headers, rps=rps)
+    return AsyncHttpClient(base_url, headers=headers, rps=rps, client=client)
@@ -1,22 +1,35 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
+import time
+from collections import defaultdict
 from dataclasses import asdict
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 import httpx
 from .chatwoot import ChatwootClient
 from .config import get_settings
+from .http import make_shared_async_client
 from .logging_setup import setup_logging
 from .storage import make_storage
 from .mapping_store import MappingStore
 from .checkpoints import CheckpointStore
 from .models import BotmakerChat, BotmakerMessage
+from .utils import iso_now
 
 logger = logging.getLogger(__name__)
 
+LOAD_PHASES = ("contacts", "chats", "messages")
+
+# Message record queued for replay into one conversation; the model and Chatwoot payload are
+# only built when the message is sent, so they do not pile up for the whole export.
+PendingMessage = Dict[str, Any]
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Load Botmaker exports into Chatwoot")
@@ -31,31 +44,34 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def iso_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+_EXPORTED_AT_TTL_NS = 1_000_000_000
+_exported_at_cache: List[Any] = [0, ""]
+
 
+def exported_at_now() -> str:
+    """``iso_now()`` reused for up to a second; per-record ``exported_at`` needs no finer precision."""
+    now = time.monotonic_ns()
+    if not _exported_at_cache[1] or now - _exported_at_cache[0] >= _EXPORTED_AT_TTL_NS:
+        _exported_at_cache[0] = now
+        _exported_at_cache[1] = iso_now()
+    return _exported_at_cache[1]
 
-def ensure_list(obj: Any) -> List[Dict[str, Any]]:
-    return list(obj) if obj else []
+
+# Container keys of Chatwoot search responses, reversed so a stack pops them in document order.
+_CANDIDATE_KEYS_REVERSED = ("results", "result", "contacts", "items", "data", "payload")
 
 
 def _extract_first_contact_id(obj: Any) -> Optional[int]:
     """Try to find a contact id from various Chatwoot search response shapes.
     Looks for integer 'id' at top-level items or nested under 'contact'.
     """
-    def _iter_candidates(o: Any):
-        if isinstance(o, dict):
-            # direct
-            yield o
-            # nested typical keys
-            for k in ("payload", "data", "items", "contacts", "result", "results"):
-                if k in o:
-                    yield from _iter_candidates(o[k])
-        elif isinstance(o, list):
-            for it in o:
-                yield from _iter_candidates(it)
-
-    for cand in _iter_candidates(obj):
+    # Depth-first walk in document order with an explicit stack (children pushed in reverse).
+    stack = [obj]
+    while stack:
+        cand = stack.pop()
+        if isinstance(cand, list):
+            stack.extend(reversed(cand))
+            continue
         if not isinstance(cand, dict):
             continue
         # direct id
@@ -66,21 +82,84 @@ def _extract_first_contact_id(obj: Any) -> Optional[int]:
         contact = cand.get("contact")
         if isinstance(contact, dict) and isinstance(contact.get("id"), int):
             return contact.get("id")
+        # nested typical keys
+        for k in _CANDIDATE_KEYS_REVERSED:
+            if k in cand:
+                stack.append(cand[k])
     return None
 
 
+async def run_concurrently(
+    records: Iterable[Dict[str, Any]],
+    worker: Callable[[Dict[str, Any]], Awaitable[None]],
+    semaphore: asyncio.Semaphore,
+    chunk_size: int,
+    after_chunk: Optional[Callable[[int], None]] = None,
+) -> None:
+    """Run ``worker`` over ``records`` concurrently, taking ``chunk_size`` records at a time.
+
+    Chunking keeps the number of pending tasks bounded for streamed inputs; ``semaphore`` caps
+    how many workers are in flight. When a worker fails, no further record of its chunk is
+    started, but workers already in flight finish (and record their mappings) before the first
+    error is re-raised: cancelling them could lose the mapping of a request Chatwoot already
+    applied, and a rerun would then create it again.
+    ``after_chunk`` runs once each chunk has completed, with the number of records done so far.
+    """
+    iterator = iter(records)
+    done = 0
+    while True:
+        chunk = list(islice(iterator, max(chunk_size, 1)))
+        if not chunk:
+            return
+        errors: List[Exception] = []
+
+        async def bounded(record: Dict[str, Any]) -> None:
+            async with semaphore:
+                if errors:
+                    return
+                try:
+                    await worker(record)
+                except Exception as exc:
+                    errors.append(exc)
+
+        await asyncio.gather(*(bounded(record) for record in chunk))
+        if errors:
+            raise errors[0]
+        done += len(chunk)
+        if after_chunk is not None:
+            after_chunk(done)
+
+
 def _parse_iso(ts: Optional[str]) -> Optional[datetime]:
     if not ts or not isinstance(ts, str):
         return None
+    return _parse_iso_str(ts)
+
+
+# Timestamps repeat heavily (the running "previous" value is compared on every message), so each
+# distinct string is parsed once; datetimes are immutable and safe to share.
+@lru_cache(maxsize=1 << 16)
+def _parse_iso_str(ts: str) -> Optional[datetime]:
     try:
-        # Accept both '...Z' and with timezone offset
-        if ts.endswith("Z"):
-            ts = ts.replace("Z", "+00:00")
+        # The C parser accepts both '...Z' and explicit offsets since Python 3.11.
         return datetime.fromisoformat(ts)
-    except Exception:
+    except ValueError:
         return None
 
 
+def _is_later(ts: str, prev: str) -> bool:
+    """Whether ISO timestamp ``ts`` is strictly after ``prev``."""
+    # Same-shape UTC strings ('...Z', equal length) order lexicographically, so the common case
+    # needs no parsing; mixed offsets or precisions fall back to comparing datetimes.
+    if isinstance(ts, str) and isinstance(prev, str) and len(ts) == len(prev) and ts[-1:] == prev[-1:] == "Z":
+        return ts > prev
+    cur_dt = _parse_iso(ts)
+    prev_dt = _parse_iso(prev)
+    return bool(cur_dt and prev_dt and cur_dt > prev_dt)
+
+
+# Called with the same last-interaction strings for every contact and chat attribute update.
+@lru_cache(maxsize=4096)
 def _date_str(ts: Optional[str]) -> Optional[str]:
     dt = _parse_iso(ts)
     if not dt:
@@ -88,141 +167,196 @@ def _date_str(ts: Optional[str]) -> Optional[str]:
     return dt.date().isoformat()
 
 
+# Exports only use a handful of distinct channel ids, so each one is lowered and scanned once.
+@lru_cache(maxsize=1024)
 def _is_whatsapp(channel_id: Optional[str]) -> bool:
     s = (channel_id or "").lower()
     return "whatsapp" in s
 
 
-def compute_interactions(
-    chats: List[Dict[str, Any]],
-    messages: List[Dict[str, Any]],
-) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, bool], Dict[str, bool]]:
-    """Compute last interaction per chat/contact and whatsapp flags.
-
-    Returns:
-      chat_last_iso: chat_id -> last ISO timestamp
-      contact_last_iso: contact_id -> last ISO timestamp
-      chat_is_whatsapp: chat_id -> bool
-      contact_is_whatsapp: contact_id -> bool
-    """
-    chat_last_iso: Dict[str, str] = {}
-    contact_last_iso: Dict[str, str] = {}
+def compute_channel_flags(
+    chats: Iterable[Dict[str, Any]],
+) -> Tuple[Dict[str, bool], Dict[str, bool]]:
+    """Return whatsapp flags per chat and per contact (OR over the contact's chats)."""
     chat_is_whatsapp: Dict[str, bool] = {}
     contact_is_whatsapp: Dict[str, bool] = {}
-
-    # initialize channel flags from chats
     for rec in chats:
         cid = rec.get("chat_id")
         contact_id = rec.get("contact_id")
-        ch = rec.get("channel_id")
+        whatsapp = _is_whatsapp(rec.get("channel_id"))
         if cid:
-            chat_is_whatsapp[cid] = _is_whatsapp(ch)
+            chat_is_whatsapp[cid] = whatsapp
         if contact_id:
             # OR aggregation at contact level
-            contact_is_whatsapp[contact_id] = contact_is_whatsapp.get(contact_id, False) or _is_whatsapp(ch)
+            contact_is_whatsapp[contact_id] = contact_is_whatsapp.get(contact_id, False) or whatsapp
+    return chat_is_whatsapp, contact_is_whatsapp
+
+
+def reduce_messages(
+    messages: Iterable[Dict[str, Any]]
+) -> Tuple[
+    Dict[str, str], Dict[str, str], Dict[str, str], Dict[str, str], Dict[str, str], Dict[str, str]
+]:
+    """Compute last interaction and last agent per chat/contact in a single pass over messages.
 
+    Returns:
+      chat_last_iso, contact_last_iso,
+      chat_last_agent_id, chat_last_agent_iso, contact_last_agent_id, contact_last_agent_iso
+    """
+    chat_last_iso: Dict[str, str] = {}
+    contact_last_iso: Dict[str, str] = {}
+    chat_last_agent_id: Dict[str, str] = {}
+    chat_last_agent_iso: Dict[str, str] = {}
+    contact_last_agent_id: Dict[str, str] = {}
+    contact_last_agent_iso: Dict[str, str] = {}
     for m in messages:
-        mid = m.get("creation_time")
+        ts = m.get("creation_time")
+        if not ts:
+            continue
         chat_id = m.get("chat_id")
         contact_id = m.get("contact_id")
-        if mid:
+        if chat_id:
+            prev = chat_last_iso.get(chat_id)
+            if not prev or _is_later(ts, prev):
+                chat_last_iso[chat_id] = ts
+            prevc = contact_last_iso.get(contact_id)
+            if not prevc or _is_later(ts, prevc):
+                contact_last_iso[contact_id] = ts
+
+        sender = (m.get("sender") or "").lower()
+        agent_id = m.get("agent_id")
+        if sender == "agent" or (agent_id and sender != "user"):
             if chat_id:
-                prev = chat_last_iso.get(chat_id)
-                if not prev or (_parse_iso(mid) and _parse_iso(prev) and _parse_iso(mid) > _parse_iso(prev)):
-                    chat_last_iso[chat_id] = mid
-                prevc = contact_last_iso.get(contact_id)
-                if not prevc or (_parse_iso(mid) and _parse_iso(prevc) and _parse_iso(mid) > _parse_iso(prevc)):
-                    contact_last_iso[contact_id] = mid
+                prev = chat_last_agent_iso.get(chat_id)
+                if not prev or _is_later(ts, prev):
+                    if agent_id:
+                        chat_last_agent_id[chat_id] = str(agent_id)
+                    chat_last_agent_iso[chat_id] = ts
+            if contact_id:
+                prevc = contact_last_agent_iso.get(contact_id)
+                if not prevc or _is_later(ts, prevc):
+                    if agent_id:
+                        contact_last_agent_id[contact_id] = str(agent_id)
+                    contact_last_agent_iso[contact_id] = ts
+    return (
+        chat_last_iso,
+        contact_last_iso,
+        chat_last_agent_id,
+        chat_last_agent_iso,
+        contact_last_agent_id,
+        contact_last_agent_iso,
+    )
+
+
+def compute_interactions(
+    chats: Iterable[Dict[str, Any]],
+    messages: Iterable[Dict[str, Any]],
+) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, bool], Dict[str, bool]]:
+    """Compute last interaction per chat/contact and whatsapp flags.
+
+    Returns:
+      chat_last_iso: chat_id -> last ISO timestamp
+      contact_last_iso: contact_id -> last ISO timestamp
+      chat_is_whatsapp: chat_id -> bool
+      contact_is_whatsapp: contact_id -> bool
+    """
+    chat_is_whatsapp, contact_is_whatsapp = compute_channel_flags(chats)
+    chat_last_iso, contact_last_iso = reduce_messages(messages)[:2]
     return chat_last_iso, contact_last_iso, chat_is_whatsapp, contact_is_whatsapp
 
 
 def _sanitize_labels(values: Optional[List[Any]]) -> List[str]:
-    out: List[str] = []
     if not isinstance(values, list):
-        return out
-    seen = set()
-    for v in values:
-        if v is None:
-            continue
-        s = str(v).strip()
-        if not s:
-            continue
-        key = s.lower()
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append(s)
-    return out
+        return []
+    # Stringified before the cache lookup: equal-hashing values such as 1, 1.0 and True would
+    # otherwise share an entry, and nested (unhashable) tag values become cacheable.
+    return list(_sanitize_label_tuple(tuple(str(v) for v in values if v is not None)))
+
+
+# Chats share a small set of tag lists, so each distinct (ordered) list is sanitized once.
+@lru_cache(maxsize=8192)
+def _sanitize_label_tuple(values: Tuple[str, ...]) -> Tuple[str, ...]:
+    # Case-insensitive dedup keeping the first spelling; dicts preserve insertion order.
+    labels: Dict[str, str] = {}
+    for label in (v.strip() for v in values):
+        if label:
+            labels.setdefault(label.lower(), label)
+    return tuple(labels.values())
+
+
+def _phone_e164(contact_id: Any) -> Optional[str]:
+    """Chatwoot expects E.164 phones with a leading '+'; Botmaker phone contact ids are bare digits."""
+    # Only string ids are phones; numeric ids from other sources are left without one.
+    if not isinstance(contact_id, str):
+        return None
+    # isascii() keeps out Unicode digits (e.g. '²' or Arabic-Indic) that isdigit() alone accepts.
+    return "+" + contact_id if contact_id.isascii() and contact_id.isdigit() else None
 
 
 def contact_payload(contact: Dict[str, Any]) -> Dict[str, Any]:
-    full_name = " ".join(filter(None, [contact.get("first_name"), contact.get("last_name")])).strip()
-    # Normalize phone: Chatwoot expects E.164 format with leading '+'.
-    raw_phone = contact.get("contact_id")
-    phone_e164 = None
-    if isinstance(raw_phone, str) and raw_phone.isdigit():
-        phone_e164 = "+" + raw_phone
+    get = contact.get
+    first_name = get("first_name")
+    last_name = get("last_name")
+    contact_id = get("contact_id")
+    full_name = " ".join(filter(None, [first_name, last_name])).strip()
 
+    # Only keys with a value are set, to avoid API validation errors (avatar_url is never sent).
     payload: Dict[str, Any] = {
-        "name": full_name or contact.get("first_name") or contact.get("last_name") or contact.get("contact_id"),
-        "identifier": contact.get("contact_id"),
-        "email": contact.get("email"),
-        "avatar_url": None,
-        "phone_number": phone_e164,
-        "custom_attributes": {
-            "botmaker_channel_id": contact.get("channel_id"),
-            "botmaker_chat_id": contact.get("chat_id"),
-            "botmaker_external_id": contact.get("external_id"),
-            "botmaker_tags": contact.get("tags", []),
-            "botmaker_variables": contact.get("variables", {}),
-            "botmaker_inserted_at": contact.get("inserted_at"),
-        },
+        key: value
+        for key, value in (
+            ("name", full_name or first_name or last_name or contact_id),
+            ("identifier", contact_id),
+            ("email", get("email")),
+            ("phone_number", _phone_e164(contact_id)),
+        )
+        if value not in (None, "")
+    }
+    payload["custom_attributes"] = {
+        "botmaker_channel_id": get("channel_id"),
+        "botmaker_chat_id": get("chat_id"),
+        "botmaker_external_id": get("external_id"),
+        "botmaker_tags": get("tags", []),
+        "botmaker_variables": get("variables", {}),
+        "botmaker_inserted_at": get("inserted_at"),
     }
-    # Remove keys with None to avoid API validation errors.
-    return {k: v for k, v in payload.items() if v not in (None, "")}
+    return payload
 
 
 def compute_last_agents(
-    messages: List[Dict[str, Any]]
+    messages: Iterable[Dict[str, Any]]
 ) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str], Dict[str, str]]:
     """Return last agent per chat/contact and timestamps.
 
     Returns:
       chat_last_agent_id, chat_last_agent_iso, contact_last_agent_id, contact_last_agent_iso
     """
-    chat_last_agent_id: Dict[str, str] = {}
-    chat_last_agent_iso: Dict[str, str] = {}
-    contact_last_agent_id: Dict[str, str] = {}
-    contact_last_agent_iso: Dict[str, str] = {}
-    for m in messages:
-        sender = (m.get("sender") or "").lower()
-        agent_id = m.get("agent_id")
-        if sender == "agent" or (agent_id and sender != "user"):
-            ts = m.get("creation_time")
-            chat_id = m.get("chat_id")
-            contact_id = m.get("contact_id")
-            if chat_id and ts:
-                prev = chat_last_agent_iso.get(chat_id)
-                if not prev or (_parse_iso(ts) and _parse_iso(prev) and _parse_iso(ts) > _parse_iso(prev)):
-                    if agent_id:
-                        chat_last_agent_id[chat_id] = str(agent_id)
-                    chat_last_agent_iso[chat_id] = ts
-            if contact_id and ts:
-                prevc = contact_last_agent_iso.get(contact_id)
-                if not prevc or (_parse_iso(ts) and _parse_iso(prevc) and _parse_iso(ts) > _parse_iso(prevc)):
-                    if agent_id:
-                        contact_last_agent_id[contact_id] = str(agent_id)
-                    contact_last_agent_iso[contact_id] = ts
-    return chat_last_agent_id, chat_last_agent_iso, contact_last_agent_id, contact_last_agent_iso
+    return reduce_messages(messages)[2:]  # type: ignore[return-value]
+
+
+class ChatActivity(NamedTuple):
+    """The message-reduce values of one chat, looked up together once per chat."""
+
+    last_iso: Optional[str]
+    is_whatsapp: Optional[bool]
+    last_agent_id: Optional[str]
+    last_agent_iso: Optional[str]
 
 
-def _conversation_note_for_chat(
-    chat: BotmakerChat,
-    last_iso: Optional[str],
-    is_whatsapp: Optional[bool],
-    last_agent_id: Optional[str] = None,
-    last_agent_iso: Optional[str] = None,
-) -> Optional[str]:
+def _activity_attributes(activity: ChatActivity) -> Dict[str, Any]:
+    """Conversation attributes derived from the chat's messages (channel, last interaction, agent)."""
+    attrs: Dict[str, Any] = {}
+    if activity.is_whatsapp is not None:
+        attrs["whatsapp"] = bool(activity.is_whatsapp)
+    du = _date_str(activity.last_iso)
+    if du is not None:
+        attrs["data_ultima_interacao"] = du
+    if activity.last_agent_id:
+        attrs["ultimo_atendente"] = activity.last_agent_id
+    return attrs
+
+
+def _conversation_note_for_chat(chat: BotmakerChat, activity: ChatActivity) -> Optional[str]:
+    last_iso, is_whatsapp, last_agent_id, last_agent_iso = activity
     parts: List[str] = []
     parts.append("Importado de Botmaker")
     if chat.agent_id:
@@ -269,22 +403,39 @@ def additional_attributes_for_chat(chat: BotmakerChat) -> Dict[str, Any]:
     }
 
 
+def _media_content(label: str) -> Callable[[Dict[str, Any]], Optional[str]]:
+    def render(content: Dict[str, Any]) -> Optional[str]:
+        media = content.get("media")
+        return f"[{label}] {media.get('url', 'binary')}" if media else None
+
+    return render
+
+
+def _button_content(content: Dict[str, Any]) -> Optional[str]:
+    selected = content.get("selectedButton")
+    return f"[Button] {selected}" if selected else None
+
+
+# Botmaker content type -> renderer; a renderer returns None to fall back to ``originalText``.
+_CONTENT_RENDERERS: Dict[str, Callable[[Dict[str, Any]], Optional[str]]] = {
+    "text": lambda content: content.get("text"),
+    "buttons": _button_content,
+    "image": _media_content("Image"),
+    "audio": _media_content("Audio"),
+    "file": _media_content("File"),
+}
+
+
 def determine_message_content(message: BotmakerMessage) -> str:
     content = message.content or {}
     message_type = content.get("type")
-    if message_type == "text" and content.get("text"):
-        return content.get("text")
-    if message_type == "buttons" and content.get("selectedButton"):
-        return f"[Button] {content.get('selectedButton')}"
-    if message_type == "image" and content.get("media"):
-        return f"[Image] {content['media'].get('url', 'binary')}"
-    if message_type == "audio" and content.get("media"):
-        return f"[Audio] {content['media'].get('url', 'binary')}"
-    if message_type == "file" and content.get("media"):
-        return f"[File] {content['media'].get('url', 'binary')}"
-    if content.get("originalText"):
-        return content["originalText"]
-    return f"[{message_type or 'unknown'} message without text]"
+    # Raw records may carry an unhashable "type" (list/dict), which simply has no renderer.
+    render = _CONTENT_RENDERERS.get(message_type) if isinstance(message_type, str) else None
+    return (
+        (render(content) if render else None)
+        or content.get("originalText")
+        or f"[{message_type or 'unknown'} message without text]"
+    )
 
 
 def message_type_for_chatwoot(message: BotmakerMessage) -> str:
@@ -295,9 +446,11 @@ def message_type_for_chatwoot(message: BotmakerMessage) -> str:
 
 
 def message_payload(message: BotmakerMessage) -> Dict[str, Any]:
+    # Anything other than "user" in any case (agents, bots, system) is outgoing.
+    sender = (message.sender or "").lower()
     payload = {
         "content": determine_message_content(message),
-        "message_type": message_type_for_chatwoot(message),
+        "message_type": "incoming" if sender == "user" else "outgoing",
         "content_attributes": {
             "botmaker": message.content,
             "original_sent_at": message.creation_time,
@@ -306,13 +459,13 @@ def message_payload(message: BotmakerMessage) -> Dict[str, Any]:
             "botmaker_sender": message.sender,
         },
     }
-    if payload["message_type"] == "outgoing" and message.sender == "agent":
+    # Only the exact "agent" sender is marked public; other spellings stay as they were.
+    if message.sender == "agent":
         payload["private"] = False
     return payload
 
 
-def main() -> None:
-    args = parse_args()
+async def run_load(args: argparse.Namespace) -> None:
     settings = get_settings()
     setup_logging(settings.log_dir)
 
@@ -320,60 +473,187 @@ def main() -> None:
     checkpoints = CheckpointStore(settings.mappings_dir, filename="loader_checkpoint.json")
     if args.reset_checkpoint:
         checkpoints.delete("last_load")
+        checkpoints.delete("load_progress")
 
     contact_map = MappingStore(settings.mappings_dir, "contact_map.json")
     conversation_map = MappingStore(settings.mappings_dir, "conversation_map.json")
     message_map = MappingStore(settings.mappings_dir, "message_map.json")
 
+    def flush_mappings() -> None:
+        # Mapping updates are kept in memory and written once per chunk instead of once per record.
+        contact_map.flush()
+        conversation_map.flush()
+        message_map.flush()
+
     chunk_size = args.chunk_size or settings.chunk_size
+    # Loop invariants, resolved once for every record below.
+    account_id = settings.chatwoot_account_id
+    inbox_id_val: Any = settings.chatwoot_inbox_id
+    try:
+        inbox_id_val = int(inbox_id_val)
+    except (TypeError, ValueError):
+        pass
 
     input_prefix = args.input_prefix.rstrip("/")
+
+    # Contacts and chats record how many input lines were completed after every chunk, so a
+    # restarted run seeks past them. Messages always restart their phase: replay finishes out
+    # of order, and message_map already skips the ones that were sent.
+    progress = checkpoints.get("load_progress")
+    if args.dry_run or not progress or progress.get("input_prefix") != input_prefix:
+        progress = None
+    resume_phase = LOAD_PHASES.index(progress["phase"]) if progress else 0
+    resume_offset = progress.get("offset", 0) if progress else 0
+    # Status records already written per phase, so the summary also counts the interrupted run.
+    resume_counts: Dict[str, int] = progress.get("counts", {}) if progress else {}
+    if progress:
+        logger.info("Resuming load", extra={"phase": progress["phase"], "offset": resume_offset})
+
+    def resume_records(phase: str, records: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        index = LOAD_PHASES.index(phase)
+        if index < resume_phase:
+            return iter(())
+        if index == resume_phase and resume_offset:
+            return islice(records, resume_offset, None)
+        return records
+
+    def resumed_past_start(phase: str) -> bool:
+        index = LOAD_PHASES.index(phase)
+        return index < resume_phase or (index == resume_phase and resume_offset > 0)
+
+    def save_progress(phase: str) -> Callable[[int], None]:
+        base = resume_offset if LOAD_PHASES.index(phase) == resume_phase else 0
+
+        def after_chunk(done: int) -> None:
+            flush_mappings()
+            if args.dry_run:
+                return
+            checkpoints.set(
+                "load_progress",
+                {
+                    "input_prefix": input_prefix,
+                    "phase": phase,
+                    "offset": base + done,
+                    "counts": {"contacts": contacts_updated.count, "chats": chats_updated.count},
+                },
+            )
+            checkpoints.flush()
+
+        return after_chunk
     contacts_path = f"{input_prefix}/contacts.ndjson"
     chats_path = f"{input_prefix}/chats.ndjson"
     messages_path = f"{input_prefix}/messages.ndjson"
 
-    contacts_records = ensure_list(storage.read_ndjson(contacts_path))
-    chats_records = ensure_list(storage.read_ndjson(chats_path))
-    messages_records = ensure_list(storage.read_ndjson(messages_path)) if not args.skip_messages else []
-    # Compute last interaction timestamps and channel flags
-    chat_last_iso, contact_last_iso, chat_is_whatsapp, contact_is_whatsapp = compute_interactions(
-        chats_records, messages_records
-    )
-    # Compute last agents per chat/contact
+    # Inputs are streamed from disk rather than held in memory: the summaries below take their
+    # own pass over the files and each phase re-reads the file it walks (messages in slices of
+    # chunk_size records, so the largest input is never materialised).
+    def read_messages() -> Iterable[Dict[str, Any]]:
+        return storage.read_ndjson(messages_path) if not args.skip_messages else []
+
+    # Channel flags from the chats, then last interaction and last agent timestamps in one pass
+    chat_is_whatsapp, contact_is_whatsapp = compute_channel_flags(storage.read_ndjson(chats_path))
     (
+        chat_last_iso,
+        contact_last_iso,
         chat_last_agent_id,
         chat_last_agent_iso,
         contact_last_agent_id,
         contact_last_agent_iso,
-    ) = compute_last_agents(messages_records)
+    ) = reduce_messages(read_messages())
 
     logger.info(
         "Loaded export references",
         extra={
-            "contacts": len(contacts_records),
-            "chats": len(chats_records),
-            "messages": len(messages_records),
+            "chats": len(chat_is_whatsapp),
+            "contacts_with_chats": len(contact_is_whatsapp),
         },
     )
 
     client = None
+    http_client = None
     if not args.dry_run:
+        http_client = make_shared_async_client()
         client = ChatwootClient(
             settings.chatwoot_base_url,
             settings.chatwoot_api_access_token,
             settings.rate_limit_rps,
+            client=http_client,
         )
 
-    contacts_updated: List[Dict[str, Any]] = []
-    chats_updated: List[Dict[str, Any]] = []
-    messages_updated: List[Dict[str, Any]] = []
+    # Status records are written as each one is settled instead of being collected first.
+    # A resumed phase appends to the status file of the interrupted run (records of the chunk that
+    # was interrupted may then appear twice).
+    contacts_updated = storage.open_ndjson(
+        f"{input_prefix}/contacts_export_status.ndjson", append=resumed_past_start("contacts")
+    )
+    chats_updated = storage.open_ndjson(
+        f"{input_prefix}/chats_export_status.ndjson", append=resumed_past_start("chats")
+    )
+    messages_updated = None if args.skip_messages else storage.open_ndjson(
+        f"{input_prefix}/messages_export_status.ndjson"
+    )
+    for phase, writer in (("contacts", contacts_updated), ("chats", chats_updated)):
+        if resumed_past_start(phase):
+            # Checkpoints saved before counts were recorded only know the resumed phase's offset.
+            fallback = resume_offset if LOAD_PHASES.index(phase) == resume_phase else 0
+            writer.count = resume_counts.get(phase, fallback)
 
     try:
+        # Contacts, then chats, are processed concurrently in chunks; each phase completes before the next.
+        semaphore = asyncio.Semaphore(settings.load_concurrency)
+
+        async def run_phase(
+            phase: str, records: Iterable[Dict[str, Any]], worker: Callable[[Dict[str, Any]], Awaitable[None]]
+        ) -> None:
+            if client is None:
+                # Dry runs make no requests, so workers never wait and there is nothing to overlap:
+                # run them inline instead of paying for a task per record.
+                for record in records:
+                    await worker(record)
+                return
+            await run_concurrently(
+                resume_records(phase, records), worker, semaphore, chunk_size, save_progress(phase)
+            )
+
+        async def backfill_contact_attributes(contact_id: str, mapping: Dict[str, Any]) -> None:
+            try:
+                cw_cid = int(mapping.get("chatwoot_contact_id"))
+                ca: Dict[str, Any] = {}
+                w = contact_is_whatsapp.get(contact_id)
+                if w is not None:
+                    ca["whatsapp"] = bool(w)
+                du = _date_str(contact_last_iso.get(contact_id))
+                if du is not None:
+                    ca["data_ultima_interacao"] = du
+                la = contact_last_agent_id.get(contact_id)
+                if la:
+                    ca["ultimo_atendente"] = la
+                if ca:
+                    await client.update_contact(account_id, cw_cid, {"custom_attributes": ca})
+            except Exception:
+                logger.exception("Failed to update contact attributes", extra={"contact_id": contact_id})
+
+        async def backfill_contact_note(
+            raw_contact: Dict[str, Any], contact_id: str, mapping: Dict[str, Any]
+        ) -> None:
+            # Backfill a contact note if not seeded yet
+            try:
+                if not mapping.get("contact_note_seeded"):
+                    note = _contact_note_for_contact(raw_contact, contact_last_agent_id.get(contact_id))
+                    if note:
+                        await client.create_contact_note(
+                            account_id, int(mapping.get("chatwoot_contact_id")), {"content": note}
+                        )
+                        mapping["contact_note_seeded"] = True
+                        contact_map.set(contact_id, mapping)
+            except Exception:
+                logger.exception("Failed to backfill contact note", extra={"contact_id": contact_id})
+
         # Contacts
-        for raw_contact in contacts_records:
+        async def process_contact(raw_contact: Dict[str, Any]) -> None:
             contact_id = raw_contact.get("contact_id")
             if not contact_id:
-                continue
+                return
 
             mapping = contact_map.get(contact_id)
             if mapping and not mapping.get("chatwoot_contact_id"):
@@ -387,38 +667,17 @@ def main() -> None:
                 raw_contact["exported_at"] = mapping.get("exported_at")
                 # Optionally update attributes (whatsapp, data_ultima_interacao) and add a note once
                 if client is not None and mapping.get("chatwoot_contact_id"):
-                    try:
-                        cw_cid = int(mapping.get("chatwoot_contact_id"))
-                        ca: Dict[str, Any] = {}
-                        w = contact_is_whatsapp.get(contact_id)
-                        if w is not None:
-                            ca["whatsapp"] = bool(w)
-                        du = _date_str(contact_last_iso.get(contact_id))
-                        if du is not None:
-                            ca["data_ultima_interacao"] = du
-                        la = contact_last_agent_id.get(contact_id)
-                        if la:
-                            ca["ultimo_atendente"] = la
-                        if ca:
-                            client.update_contact(settings.chatwoot_account_id, cw_cid, {"custom_attributes": ca})
-                    except Exception:
-                        logger.exception("Failed to update contact attributes", extra={"contact_id": contact_id})
-                    # Backfill a contact note if not seeded yet
-                    try:
-                        if not mapping.get("contact_note_seeded"):
-                            note = _contact_note_for_contact(raw_contact, contact_last_agent_id.get(contact_id))
-                            if note:
-                                client.create_contact_note(settings.chatwoot_account_id, int(cw_cid), {"content": note})
-                                mapping["contact_note_seeded"] = True
-                                contact_map.set(contact_id, mapping)
-                    except Exception:
-                        logger.exception("Failed to backfill contact note", extra={"contact_id": contact_id})
+                    # The attribute update and the note are independent requests, so they run together.
+                    await asyncio.gather(
+                        backfill_contact_attributes(contact_id, mapping),
+                        backfill_contact_note(raw_contact, contact_id, mapping),
+                    )
             elif args.dry_run:
                 logger.info("[DRY-RUN] Would create Chatwoot contact", extra={"contact_id": contact_id})
             else:
                 payload = contact_payload(raw_contact)
                 try:
-                    response = client.create_contact(settings.chatwoot_account_id, payload)
+                    response = await client.create_contact(account_id, payload)
                     cw_id = response.get("id") if isinstance(response, dict) else None
                     if cw_id is None:
                         cw_id = _extract_first_contact_id(response)
@@ -430,7 +689,7 @@ def main() -> None:
                             if val:
                                 queries.append(str(val))
                         for q in queries:
-                            search = client.search_contacts(settings.chatwoot_account_id, q)
+                            search = await client.search_contacts(account_id, q)
                             cid = _extract_first_contact_id(search)
                             if cid:
                                 cw_id = cid
@@ -442,7 +701,7 @@ def main() -> None:
                         )
                         raise RuntimeError("Missing Chatwoot contact id after creation")
 
-                    exported_at = iso_now()
+                    exported_at = exported_at_now()
                     contact_map.set(
                         contact_id,
                         {
@@ -470,13 +729,13 @@ def main() -> None:
                         if la:
                             ca["ultimo_atendente"] = la
                         if ca:
-                            client.update_contact(settings.chatwoot_account_id, int(cw_id), {"custom_attributes": ca})
+                            await client.update_contact(account_id, int(cw_id), {"custom_attributes": ca})
                     except Exception:
                         logger.exception("Failed to set contact attributes post-create", extra={"contact_id": contact_id})
                     try:
                         note = _contact_note_for_contact(raw_contact, contact_last_agent_id.get(contact_id))
                         if note:
-                            client.create_contact_note(settings.chatwoot_account_id, int(cw_id), {"content": note})
+                            await client.create_contact_note(account_id, int(cw_id), {"content": note})
                     except Exception:
                         logger.exception("Failed to create contact note", extra={"contact_id": contact_id})
                 except httpx.HTTPStatusError as exc:
@@ -496,7 +755,7 @@ def main() -> None:
                         try:
                             # 1) Free-text search attempts
                             for q in queries:
-                                search = client.search_contacts(settings.chatwoot_account_id, q)
+                                search = await client.search_contacts(account_id, q)
                                 cid = _extract_first_contact_id(search)
                                 if cid:
                                     chatwoot_contact_id = cid
@@ -504,22 +763,22 @@ def main() -> None:
                             # 2) List endpoint with direct filters (best-effort)
                             if not chatwoot_contact_id:
                                 if payload.get("identifier"):
-                                    res = client.list_contacts(settings.chatwoot_account_id, identifier=payload["identifier"])  # type: ignore[arg-type]
+                                    res = await client.list_contacts(account_id, identifier=payload["identifier"])  # type: ignore[arg-type]
                                     cid = _extract_first_contact_id(res)
                                     if cid:
                                         chatwoot_contact_id = cid
                                 if not chatwoot_contact_id and payload.get("email"):
-                                    res = client.list_contacts(settings.chatwoot_account_id, email=payload["email"])  # type: ignore[arg-type]
+                                    res = await client.list_contacts(account_id, email=payload["email"])  # type: ignore[arg-type]
                                     cid = _extract_first_contact_id(res)
                                     if cid:
                                         chatwoot_contact_id = cid
                                 if not chatwoot_contact_id and payload.get("phone_number"):
-                                    res = client.list_contacts(settings.chatwoot_account_id, phone_number=payload["phone_number"])  # type: ignore[arg-type]
+                                    res = await client.list_contacts(account_id, phone_number=payload["phone_number"])  # type: ignore[arg-type]
                                     cid = _extract_first_contact_id(res)
                                     if cid:
                                         chatwoot_contact_id = cid
                             if chatwoot_contact_id:
-                                exported_at = iso_now()
+                                exported_at = exported_at_now()
                                 contact_map.set(
                                     contact_id,
                                     {
@@ -539,17 +798,19 @@ def main() -> None:
                                 # 3) Try alternative payloads (avoid conflicting field)
                                 alt_payloads: List[Dict[str, Any]] = []
                                 # a) drop phone_number
-                                p1 = {k: v for k, v in payload.items() if k != "phone_number"}
+                                p1 = payload.copy()
+                                p1.pop("phone_number", None)
                                 alt_payloads.append(p1)
                                 # b) drop identifier (keep phone/email)
-                                p2 = {k: v for k, v in payload.items() if k != "identifier"}
+                                p2 = payload.copy()
+                                p2.pop("identifier", None)
                                 alt_payloads.append(p2)
 
                                 alt_created = False
                                 for ap in alt_payloads:
                                     try:
-                                        r = client.create_contact(settings.chatwoot_account_id, ap)
-                                        exported_at = iso_now()
+                                        r = await client.create_contact(account_id, ap)
+                                        exported_at = exported_at_now()
                                         contact_map.set(
                                             contact_id,
                                             {
@@ -593,171 +854,179 @@ def main() -> None:
                     else:
                         raise
 
-            contacts_updated.append(raw_contact)
+            contacts_updated.write(raw_contact)
+
+        await run_phase("contacts", storage.read_ndjson(contacts_path), process_contact)
 
         if args.skip_conversations and not args.skip_messages:
             logger.warning("Skipping conversations but attempting to send messages may fail if conversations do not exist")
 
+        async def reconcile_contact(chat: BotmakerChat) -> Optional[Dict[str, Any]]:
+            """Find or create the Chatwoot contact of an unmapped chat contact; ``None`` skips the chat."""
+            # Try to reconcile by searching Chatwoot (identifier/phone/email)
+            try:
+                queries: List[str] = []
+                phone = _phone_e164(chat.contact_id)
+                # identifier (raw contact_id)
+                if chat.contact_id:
+                    queries.append(str(chat.contact_id))
+                # E.164 phone
+                if phone:
+                    queries.append(phone)
+                cw_cid: Optional[int] = None
+                for q in queries:
+                    search = await client.search_contacts(account_id, q)
+                    cid = _extract_first_contact_id(search)
+                    if cid:
+                        cw_cid = cid
+                        break
+                if not cw_cid:
+                    # Try list endpoint with filters
+                    for params in (
+                        {"identifier": chat.contact_id},
+                        {"phone_number": phone},
+                    ):
+                        params = {k: v for k, v in params.items() if v}
+                        if not params:
+                            continue
+                        res = await client.list_contacts(account_id, **params)
+                        cid = _extract_first_contact_id(res)
+                        if cid:
+                            cw_cid = cid
+                            break
+                if not cw_cid:
+                    # As a last resort, create the contact from chat info
+                    chat_like = {
+                        "contact_id": chat.contact_id,
+                        "channel_id": chat.channel_id,
+                        "first_name": chat.first_name,
+                        "last_name": chat.last_name,
+                        "email": chat.email,
+                        "variables": chat.variables,
+                        "tags": chat.tags,
+                        "inserted_at": chat.inserted_at,
+                    }
+                    cp = contact_payload(chat_like)
+                    resp = await client.create_contact(account_id, cp)
+                    cw_cid = resp.get("id") if isinstance(resp, dict) else _extract_first_contact_id(resp)
+                if cw_cid:
+                    reconciled = {
+                        "chatwoot_contact_id": cw_cid,
+                        "exported_at": exported_at_now(),
+                        "payload": {"identifier": chat.contact_id},
+                        "reconciled": True,
+                    }
+                    contact_map.set(chat.contact_id, reconciled)
+                    return reconciled
+                logger.warning(
+                    "Contact not exported yet; skipping chat",
+                    extra={"chat_id": chat.chat_id, "contact_id": chat.contact_id},
+                )
+                return None
+            except Exception:
+                logger.exception(
+                    "Failed to reconcile missing contact mapping via search/create",
+                    extra={"chat_id": chat.chat_id, "contact_id": chat.contact_id},
+                )
+                return None
+
         # Conversations
-        chat_limit_counter = 0
-        for chat_record in chats_records:
-            chat_limit_counter += 1
-            if args.limit_chats and chat_limit_counter > args.limit_chats:
-                break
+        contact_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+        def chat_activity(chat_id: str) -> ChatActivity:
+            return ChatActivity(
+                chat_last_iso.get(chat_id),
+                chat_is_whatsapp.get(chat_id),
+                chat_last_agent_id.get(chat_id),
+                chat_last_agent_iso.get(chat_id),
+            )
 
-            chat = BotmakerChat(**chat_record)
-            mapping = conversation_map.get(chat.chat_id)
+        async def backfill_conversation_attributes(
+            chat: BotmakerChat, activity: ChatActivity, mapping: Dict[str, Any]
+        ) -> None:
+            try:
+                conv_id = int(mapping.get("chatwoot_conversation_id"))
+                # enrich current attributes
+                add_attrs = additional_attributes_for_chat(chat)
+                add_attrs.update(_activity_attributes(activity))
+                await client.update_conversation(account_id, conv_id, {"additional_attributes": add_attrs})
+            except Exception:
+                logger.exception(
+                    "Failed to backfill conversation attributes",
+                    extra={"chat_id": chat.chat_id},
+                )
+
+        async def backfill_conversation_labels(chat: BotmakerChat, mapping: Dict[str, Any]) -> None:
+            # Labels (tags)
+            try:
+                labels = _sanitize_labels(chat.tags)
+                if labels:
+                    conv_id = int(mapping.get("chatwoot_conversation_id"))
+                    await client.add_conversation_labels(account_id, conv_id, labels)
+            except Exception:
+                logger.exception(
+                    "Failed to backfill conversation labels",
+                    extra={"chat_id": chat.chat_id, "labels": chat.tags},
+                )
+
+        async def backfill_conversation_note(
+            chat: BotmakerChat, activity: ChatActivity, mapping: Dict[str, Any]
+        ) -> None:
+            try:
+                if not mapping.get("conversation_note_seeded"):
+                    note = _conversation_note_for_chat(chat, activity)
+                    if note:
+                        await client.create_message(
+                            account_id,
+                            int(mapping.get("chatwoot_conversation_id")),
+                            {"content": note, "private": True, "message_type": "outgoing"},
+                        )
+                        mapping["conversation_note_seeded"] = True
+                        conversation_map.set(chat.chat_id, mapping)
+            except Exception:
+                logger.exception("Failed to backfill conversation note", extra={"chat_id": chat.chat_id})
+
+        async def export_chat(chat_record: Dict[str, Any]) -> None:
+            """Create or backfill the conversation of one chat, flagging ``chat_record`` in place."""
+            # Already exported chats are triaged on the raw record; the model is built only when used.
+            mapping = conversation_map.get(chat_record.get("chat_id"))
             if mapping:
                 chat_record["exported_to_chatwoot"] = True
                 chat_record["exported_at"] = mapping.get("exported_at")
                 # Backfill conversation attributes and note once
                 if client is not None and mapping.get("chatwoot_conversation_id"):
-                    try:
-                        conv_id = int(mapping.get("chatwoot_conversation_id"))
-                        # enrich current attributes
-                        add_attrs = additional_attributes_for_chat(chat)
-                        w = chat_is_whatsapp.get(chat.chat_id)
-                        if w is not None:
-                            add_attrs["whatsapp"] = bool(w)
-                        du = _date_str(chat_last_iso.get(chat.chat_id))
-                        if du is not None:
-                            add_attrs["data_ultima_interacao"] = du
-                        la = chat_last_agent_id.get(chat.chat_id)
-                        if la:
-                            add_attrs["ultimo_atendente"] = la
-                        client.update_conversation(
-                            settings.chatwoot_account_id, conv_id, {"additional_attributes": add_attrs}
-                        )
-                    except Exception:
-                        logger.exception(
-                            "Failed to backfill conversation attributes",
-                            extra={"chat_id": chat.chat_id},
-                        )
-                    # Labels (tags)
-                    try:
-                        labels = _sanitize_labels(chat.tags)
-                        if labels:
-                            client.add_conversation_labels(settings.chatwoot_account_id, conv_id, labels)
-                    except Exception:
-                        logger.exception(
-                            "Failed to backfill conversation labels",
-                            extra={"chat_id": chat.chat_id, "labels": chat.tags},
-                        )
-                    # Note
-                    try:
-                        if not mapping.get("conversation_note_seeded"):
-                            note = _conversation_note_for_chat(
-                                chat,
-                                chat_last_iso.get(chat.chat_id),
-                                chat_is_whatsapp.get(chat.chat_id),
-                                chat_last_agent_id.get(chat.chat_id),
-                                chat_last_agent_iso.get(chat.chat_id),
-                            )
-                            if note:
-                                client.create_message(
-                                    settings.chatwoot_account_id,
-                                    int(mapping.get("chatwoot_conversation_id")),
-                                    {"content": note, "private": True, "message_type": "outgoing"},
-                                )
-                                mapping["conversation_note_seeded"] = True
-                                conversation_map.set(chat.chat_id, mapping)
-                    except Exception:
-                        logger.exception("Failed to backfill conversation note", extra={"chat_id": chat.chat_id})
-                chats_updated.append(chat_record)
-                continue
+                    chat = BotmakerChat(**chat_record)
+                    activity = chat_activity(chat.chat_id)
+                    # Attributes, labels and the note are independent requests, so they run together.
+                    await asyncio.gather(
+                        backfill_conversation_attributes(chat, activity, mapping),
+                        backfill_conversation_labels(chat, mapping),
+                        backfill_conversation_note(chat, activity, mapping),
+                    )
+                return
 
+            chat = BotmakerChat(**chat_record)
             contact_mapping = contact_map.get(chat.contact_id)
             if not contact_mapping or not contact_mapping.get("chatwoot_contact_id"):
-                # Try to reconcile by searching Chatwoot (identifier/phone/email)
-                try:
-                    queries: List[str] = []
-                    # identifier (raw contact_id)
-                    if chat.contact_id:
-                        queries.append(str(chat.contact_id))
-                    # E.164 phone
-                    if chat.contact_id and str(chat.contact_id).isdigit():
-                        queries.append("+" + str(chat.contact_id))
-                    cw_cid: Optional[int] = None
-                    for q in queries:
-                        search = client.search_contacts(settings.chatwoot_account_id, q)
-                        cid = _extract_first_contact_id(search)
-                        if cid:
-                            cw_cid = cid
-                            break
-                    if not cw_cid:
-                        # Try list endpoint with filters
-                        for params in (
-                            {"identifier": chat.contact_id},
-                            {"phone_number": ("+" + str(chat.contact_id)) if str(chat.contact_id).isdigit() else None},
-                        ):
-                            params = {k: v for k, v in params.items() if v}
-                            if not params:
-                                continue
-                            res = client.list_contacts(settings.chatwoot_account_id, **params)
-                            cid = _extract_first_contact_id(res)
-                            if cid:
-                                cw_cid = cid
-                                break
-                    if not cw_cid:
-                        # As a last resort, create the contact from chat info
-                        chat_like = {
-                            "contact_id": chat.contact_id,
-                            "channel_id": chat.channel_id,
-                            "first_name": chat.first_name,
-                            "last_name": chat.last_name,
-                            "email": chat.email,
-                            "variables": chat.variables,
-                            "tags": chat.tags,
-                            "inserted_at": chat.inserted_at,
-                        }
-                        cp = contact_payload(chat_like)
-                        resp = client.create_contact(settings.chatwoot_account_id, cp)
-                        cw_cid = resp.get("id") if isinstance(resp, dict) else _extract_first_contact_id(resp)
-                    if cw_cid:
-                        exported_at = iso_now()
-                        contact_map.set(
-                            chat.contact_id,
-                            {
-                                "chatwoot_contact_id": cw_cid,
-                                "exported_at": exported_at,
-                                "payload": {"identifier": chat.contact_id},
-                                "reconciled": True,
-                            },
-                        )
-                        contact_mapping = contact_map.get(chat.contact_id)
-                    else:
-                        logger.warning(
-                            "Contact not exported yet; skipping chat",
-                            extra={"chat_id": chat.chat_id, "contact_id": chat.contact_id},
-                        )
-                        chats_updated.append(chat_record)
-                        continue
-                except Exception:
-                    logger.exception(
-                        "Failed to reconcile missing contact mapping via search/create",
-                        extra={"chat_id": chat.chat_id, "contact_id": chat.contact_id},
-                    )
-                    chats_updated.append(chat_record)
-                    continue
+                # Chats of one contact may run concurrently; the lock lets only the first reconcile it.
+                async with contact_locks[chat.contact_id]:
+                    contact_mapping = contact_map.get(chat.contact_id)
+                    if not contact_mapping or not contact_mapping.get("chatwoot_contact_id"):
+                        contact_mapping = await reconcile_contact(chat)
+                if contact_mapping is None:
+                    return
 
             if args.skip_conversations:
-                chats_updated.append(chat_record)
-                continue
+                return
 
             if args.dry_run:
                 logger.info(
                     "[DRY-RUN] Would create Chatwoot conversation",
                     extra={"chat_id": chat.chat_id, "contact_id": chat.contact_id},
                 )
-                chats_updated.append(chat_record)
-                continue
+                return
 
             # Ensure numeric types where applicable
-            inbox_id_val = settings.chatwoot_inbox_id
-            try:
-                inbox_id_val = int(inbox_id_val)  # type: ignore[assignment]
-            except Exception:
-                pass
             contact_id_val = contact_mapping.get("chatwoot_contact_id")
             try:
                 contact_id_val = int(contact_id_val)  # type: ignore[assignment]
@@ -765,17 +1034,10 @@ def main() -> None:
                 pass
 
             # Merge chat attributes with whatsapp + last interaction date
+            activity = chat_activity(chat.chat_id)
             add_attrs = additional_attributes_for_chat(chat)
             try:
-                w = chat_is_whatsapp.get(chat.chat_id)
-                if w is not None:
-                    add_attrs["whatsapp"] = bool(w)
-                du = _date_str(chat_last_iso.get(chat.chat_id))
-                if du is not None:
-                    add_attrs["data_ultima_interacao"] = du
-                la = chat_last_agent_id.get(chat.chat_id)
-                if la:
-                    add_attrs["ultimo_atendente"] = la
+                add_attrs.update(_activity_attributes(activity))
             except Exception:
                 logger.exception("Failed to enrich additional_attributes for chat", extra={"chat_id": chat.chat_id})
 
@@ -788,8 +1050,8 @@ def main() -> None:
             # Pre-create contact_inbox mapping for API channel (idempotent)
             try:
                 if isinstance(contact_id_val, int):
-                    client.create_contact_inbox(
-                        settings.chatwoot_account_id,
+                    await client.create_contact_inbox(
+                        account_id,
                         contact_id_val,
                         {"inbox_id": inbox_id_val, "source_id": chat.chat_id},
                     )
@@ -797,7 +1059,7 @@ def main() -> None:
                 # ignore errors, we'll still try to create conversation below
                 pass
             try:
-                response = client.create_conversation(settings.chatwoot_account_id, payload)
+                response = await client.create_conversation(account_id, payload)
             except httpx.HTTPStatusError as exc:
                 status = exc.response.status_code if exc.response else None
                 body = exc.response.text if exc.response else None
@@ -815,9 +1077,9 @@ def main() -> None:
                             "Attempting to create contact_inbox mapping before retry",
                             extra={"contact_id": contact_id_val, "map_payload": map_payload},
                         )
-                        client.create_contact_inbox(settings.chatwoot_account_id, contact_id_val, map_payload)  # type: ignore[arg-type]
+                        await client.create_contact_inbox(account_id, contact_id_val, map_payload)  # type: ignore[arg-type]
                         # retry
-                        response = client.create_conversation(settings.chatwoot_account_id, payload)
+                        response = await client.create_conversation(account_id, payload)
                     except httpx.HTTPStatusError as e2:
                         logger.error(
                             "Retry after contact_inbox mapping failed: status=%s body=%s",
@@ -827,147 +1089,193 @@ def main() -> None:
                         raise
                 else:
                     raise
-            exported_at = iso_now()
-            conversation_map.set(
-                chat.chat_id,
-                {
-                    "chatwoot_conversation_id": response.get("id"),
-                    "chatwoot_contact_id": contact_mapping.get("chatwoot_contact_id"),
-                    "exported_at": exported_at,
-                },
-            )
+            exported_at = exported_at_now()
+            created_mapping = {
+                "chatwoot_conversation_id": response.get("id"),
+                "chatwoot_contact_id": contact_mapping.get("chatwoot_contact_id"),
+                "exported_at": exported_at,
+            }
+            conversation_map.set(chat.chat_id, created_mapping)
             chat_record["exported_to_chatwoot"] = True
             chat_record["exported_at"] = exported_at
-            chats_updated.append(chat_record)
             logger.info(
                 "Created Chatwoot conversation",
                 extra={"chat_id": chat.chat_id, "conversation_id": response.get("id")},
             )
-            # Add labels (tags) to conversation
-            try:
-                conv_id = int(response.get("id"))
-                labels = _sanitize_labels(chat.tags)
-                if labels:
-                    client.add_conversation_labels(settings.chatwoot_account_id, conv_id, labels)
-            except Exception:
-                logger.exception(
-                    "Failed to apply conversation labels",
-                    extra={"chat_id": chat.chat_id, "labels": chat.tags},
-                )
-            # Add conversation note with agent/queue/channel/last interaction (as private message)
-            try:
-                note = _conversation_note_for_chat(
-                    chat,
-                    chat_last_iso.get(chat.chat_id),
-                    chat_is_whatsapp.get(chat.chat_id),
-                    chat_last_agent_id.get(chat.chat_id),
-                    chat_last_agent_iso.get(chat.chat_id),
-                )
-                if note:
-                    client.create_message(
-                        settings.chatwoot_account_id, int(response.get("id")), {"content": note, "private": True, "message_type": "outgoing"}
-                    )
-                    try:
-                        created_mapping = conversation_map.get(chat.chat_id) or {}
-                        created_mapping["conversation_note_seeded"] = True
-                        conversation_map.set(chat.chat_id, created_mapping)
-                    except Exception:
-                        logger.exception("Failed to mark conversation note as seeded", extra={"chat_id": chat.chat_id})
-            except Exception:
-                logger.exception("Failed to create conversation note", extra={"chat_id": chat.chat_id})
+            # Labels (tags) and the private note with agent/queue/channel/last interaction only need
+            # the new conversation id, so they are sent together through the backfill helpers.
+            await asyncio.gather(
+                backfill_conversation_labels(chat, created_mapping),
+                backfill_conversation_note(chat, activity, created_mapping),
+            )
+
+        async def process_chat(chat_record: Dict[str, Any]) -> None:
+            # Every input record reaches the status file exactly once, exported or passed through.
+            await export_chat(chat_record)
+            chats_updated.write(chat_record)
+
+        limited_chats = islice(storage.read_ndjson(chats_path), args.limit_chats or None)
+        await run_phase("chats", limited_chats, process_chat)
+        save_progress("messages")(0)
 
         # Messages
-        if not args.skip_messages:
+        if messages_updated is not None:
             total_messages_processed = 0
-            for message_record in messages_records:
-                if args.limit_messages and total_messages_processed >= args.limit_messages:
-                    break
+            # The hot loop queries the in-memory mappings directly; message_map.set() below
+            # writes through to the same dict.
+            exported_messages = message_map.snapshot()
+            conversations = conversation_map.snapshot()
+            # A conversation can span several slices; its lock keeps the replays in input order.
+            conversation_locks: Dict[Any, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+            def triage(records: List[Dict[str, Any]]) -> Dict[Any, List[PendingMessage]]:
+                """Settle the records that need no request and group the rest by conversation."""
+                nonlocal total_messages_processed
+                pending_by_conversation: Dict[Any, List[PendingMessage]] = {}
+                for message_record in records:
+                    # Plain record fields are enough to triage; the model is only built for messages sent.
+                    message_id = message_record.get("id")
+                    chat_id = message_record.get("chat_id")
+                    mapping = exported_messages.get(message_id)
+                    if mapping:
+                        message_record["exported_to_chatwoot"] = True
+                        message_record["exported_at"] = mapping.get("exported_at")
+                        messages_updated.write(message_record)
+                        total_messages_processed += 1
+                        continue
 
-                message = BotmakerMessage(**message_record)
-                mapping = message_map.get(message.id)
-                if mapping:
-                    message_record["exported_to_chatwoot"] = True
-                    message_record["exported_at"] = mapping.get("exported_at")
-                    messages_updated.append(message_record)
-                    total_messages_processed += 1
-                    continue
+                    conversation_mapping = conversations.get(chat_id)
+                    if not conversation_mapping:
+                        logger.warning(
+                            "Conversation missing for message; skipping",
+                            extra={"message_id": message_id, "chat_id": chat_id},
+                        )
+                        messages_updated.write(message_record)
+                        continue
 
-                conversation_mapping = conversation_map.get(message.chat_id)
-                if not conversation_mapping:
-                    logger.warning(
-                        "Conversation missing for message; skipping",
-                        extra={"message_id": message.id, "chat_id": message.chat_id},
-                    )
-                    messages_updated.append(message_record)
-                    continue
+                    if args.dry_run:
+                        logger.info(
+                            "[DRY-RUN] Would create Chatwoot message",
+                            extra={"message_id": message_id, "chat_id": chat_id},
+                        )
+                        messages_updated.write(message_record)
+                        total_messages_processed += 1
+                        continue
 
-                if args.dry_run:
-                    logger.info(
-                        "[DRY-RUN] Would create Chatwoot message",
-                        extra={"message_id": message.id, "chat_id": message.chat_id},
-                    )
-                    messages_updated.append(message_record)
+                    pending_by_conversation.setdefault(
+                        conversation_mapping.get("chatwoot_conversation_id"), []
+                    ).append(message_record)
                     total_messages_processed += 1
-                    continue
+                return pending_by_conversation
 
-                payload = message_payload(message)
-                response = client.create_message(
-                    settings.chatwoot_account_id,
-                    conversation_mapping.get("chatwoot_conversation_id"),
-                    payload,
-                )
-                exported_at = iso_now()
-                message_map.set(
-                    message.id,
-                    {
-                        "chatwoot_message_id": response.get("id"),
-                        "conversation_id": conversation_mapping.get("chatwoot_conversation_id"),
-                        "exported_at": exported_at,
-                    },
-                )
-                message_record["exported_to_chatwoot"] = True
-                message_record["exported_at"] = exported_at
-                messages_updated.append(message_record)
-                total_messages_processed += 1
+            replay_errors: List[Exception] = []
 
+            async def replay_conversation(conversation_id: Any, items: List[PendingMessage]) -> None:
+                async with conversation_locks[conversation_id], semaphore:
+                    for message_record in items:
+                        if replay_errors:
+                            # Once a replay failed no new message is sent, which also keeps a
+                            # conversation from continuing past the message it failed on.
+                            return
+                        try:
+                            response = await client.create_message(
+                                account_id, conversation_id, message_payload(BotmakerMessage(**message_record))
+                            )
+                        except Exception as exc:
+                            replay_errors.append(exc)
+                            return
+                        exported_at = exported_at_now()
+                        message_map.set(
+                            message_record["id"],
+                            {
+                                "chatwoot_message_id": response.get("id"),
+                                "conversation_id": conversation_id,
+                                "exported_at": exported_at,
+                            },
+                        )
+                        message_record["exported_to_chatwoot"] = True
+                        message_record["exported_at"] = exported_at
+                        messages_updated.write(message_record)
+
+            # The file is read chunk_size records at a time and at most two slices are held: the
+            # next slice is triaged and starts replaying while the previous one finishes. Within a
+            # slice conversations are replayed concurrently, each one in order, and the semaphore
+            # caps in-flight POSTs. After a failure the POSTs in flight still complete and are
+            # mapped before the first error is re-raised, so a rerun does not send them again.
+            records = iter(read_messages())
+            previous: List[asyncio.Task] = []
+            while not replay_errors:
+                size = max(chunk_size, 1)
+                if args.limit_messages:
+                    size = min(size, args.limit_messages - total_messages_processed)
+                chunk = list(islice(records, size)) if size > 0 else []
+                if not chunk:
+                    break
+                current = [
+                    asyncio.create_task(replay_conversation(conversation_id, items))
+                    for conversation_id, items in triage(chunk).items()
+                ]
+                if previous:
+                    await asyncio.gather(*previous)
+                    message_map.flush()
+                previous = current
+            await asyncio.gather(*previous)
+            if replay_errors:
+                raise replay_errors[0]
             logger.info("Messages processed", extra={"messages": total_messages_processed})
 
         # Persist status snapshots
-        storage.write_ndjson(f"{input_prefix}/contacts_export_status.ndjson", contacts_updated)
-        storage.write_ndjson(f"{input_prefix}/chats_export_status.ndjson", chats_updated)
-        if messages_updated:
-            storage.write_ndjson(f"{input_prefix}/messages_export_status.ndjson", messages_updated)
-
+        contacts_updated.close()
+        chats_updated.close()
+        messages_count = 0
+        if messages_updated is not None:
+            messages_updated.close()
+            messages_count = messages_updated.count
+
+        finished_at = iso_now()
         checkpoints.set(
             "last_load",
             {
                 "input_prefix": input_prefix,
-                "contacts_processed": len(contacts_updated),
-                "chats_processed": len(chats_updated),
-                "messages_processed": len(messages_updated),
+                "contacts_processed": contacts_updated.count,
+                "chats_processed": chats_updated.count,
+                "messages_processed": messages_count,
                 "dry_run": args.dry_run,
-                "timestamp": iso_now(),
+                "timestamp": finished_at,
             },
         )
+        checkpoints.delete("load_progress")
         # Write loader summary for web frontend
         storage.write_json(
             f"{input_prefix}/load_summary.json",
             {
                 "type": "load",
-                "timestamp": iso_now(),
+                "timestamp": finished_at,
                 "prefix": input_prefix,
                 "counts": {
-                    "contacts_updated": len(contacts_updated),
-                    "chats_updated": len(chats_updated),
-                    "messages_updated": len(messages_updated),
+                    "contacts_updated": contacts_updated.count,
+                    "chats_updated": chats_updated.count,
+                    "messages_updated": messages_count,
                 },
                 "dry_run": args.dry_run,
             },
         )
 
     finally:
+        flush_mappings()
+        contacts_updated.close()
+        chats_updated.close()
+        if messages_updated is not None:
+            messages_updated.close()
+        checkpoints.flush()
         if client is not None:
-            client.close()
+            await client.close()
+        if http_client is not None:
+            await http_client.aclose()
+
+
+def main() -> None:
+    asyncio.run(run_load(parse_args()))
 
 
 if __name__ == "__main__":
@@ -1,8 +1,13 @@
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
+
+# Console and file handlers run on this listener's thread so log calls never block on I/O.
+_listener: Optional[QueueListener] = None
 
 
 def _resolve_log_dir(preferred: str) -> Tuple[str, bool]:
@@ -17,6 +22,21 @@ def _resolve_log_dir(preferred: str) -> Tuple[str, bool]:
         return str(fallback_root), True
 
 
+def stop_logging() -> None:
+    """Drain queued records to the console/file handlers and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        root = logging.getLogger()
+        root.handlers = [handler for handler in root.handlers if not isinstance(handler, QueueHandler)]
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
 def setup_logging(log_dir: str) -> str:
     resolved_dir, used_fallback = _resolve_log_dir(log_dir)
     log_path = os.path.join(resolved_dir, "app.log")
@@ -30,21 +50,26 @@ def setup_logging(log_dir: str) -> str:
     root.setLevel(logging.INFO)
 
     # Remove handlers we manage to avoid duplicated logs when setup is invoked twice.
+    stop_logging()
     root.handlers = [
         handler
         for handler in root.handlers
-        if not isinstance(handler, (logging.StreamHandler, RotatingFileHandler))
+        if not isinstance(handler, (logging.StreamHandler, RotatingFileHandler, QueueHandler))
     ]
 
     # Console handler
     ch = logging.StreamHandler()
     ch.setFormatter(formatter)
-    root.addHandler(ch)
 
     # File handler (rotating)
     fh = RotatingFileHandler(log_path, maxBytes=5 * 1024 * 1024, backupCount=3)
     fh.setFormatter(formatter)
-    root.addHandler(fh)
+
+    global _listener
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _listener = QueueListener(log_queue, ch, fh, respect_handler_level=True)
+    _listener.start()
+    root.addHandler(QueueHandler(log_queue))
 
     if used_fallback:
         root.warning("Falling back to writable log directory: %s", resolved_dir)
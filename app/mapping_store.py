@@ -1,47 +1,117 @@
 from __future__ import annotations
 
-import json
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, Iterable, Optional, Tuple
+
+from .utils import json_dumps, json_loads
 
 
 @dataclass
 class MappingStore:
+    """Botmaker id -> Chatwoot mapping persisted as a JSON document.
+
+    The document is read once and kept in memory; ``set``/``set_bulk``/``delete`` only record
+    pending changes, which ``flush()`` writes out in a single rewrite (also on context exit).
+    Until then each change is appended to a ``.wal`` file next to the document, which is replayed
+    on the next start if the process died before flushing, so records already sent to Chatwoot
+    are not sent again.
+    """
+
     directory: str
     filename: str
 
     def __post_init__(self) -> None:
         os.makedirs(self.directory, exist_ok=True)
         self.path = os.path.join(self.directory, self.filename)
+        self.wal_path = f"{self.path}.wal"
         if not os.path.exists(self.path):
             self._write({})
+        self._data: Dict[str, Any] = self._read()
+        self._wal: Optional[BinaryIO] = None
+        self.pending = self._replay_wal()
+
+    def __enter__(self) -> "MappingStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
 
     def _read(self) -> Dict[str, Any]:
-        with open(self.path, "r", encoding="utf-8") as fh:
-            return json.load(fh)
+        with open(self.path, "rb") as fh:
+            return json_loads(fh.read())
 
     def _write(self, data: Dict[str, Any]) -> None:
         tmp_path = f"{self.path}.tmp"
-        with open(tmp_path, "w", encoding="utf-8") as fh:
-            json.dump(data, fh, ensure_ascii=False, indent=2)
+        with open(tmp_path, "wb") as fh:
+            fh.write(json_dumps(data, indent=True))
         os.replace(tmp_path, self.path)
 
+    def _replay_wal(self) -> int:
+        if not os.path.exists(self.wal_path):
+            return 0
+        replayed = 0
+        with open(self.wal_path, "rb") as fh:
+            for line in fh:
+                try:
+                    entry = json_loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-append; everything before it is intact.
+                    break
+                if entry.get("deleted"):
+                    self._data.pop(entry["key"], None)
+                else:
+                    self._data[entry["key"]] = entry["value"]
+                replayed += 1
+        return replayed
+
+    def _log(self, entries: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> None:
+        """Append changes to the WAL; a ``None`` value records a delete."""
+        if self._wal is None:
+            # Unbuffered, so every change reaches the OS before the caller moves on.
+            self._wal = open(self.wal_path, "ab", buffering=0)
+        self._wal.write(
+            b"".join(
+                json_dumps({"key": key, "deleted": True} if value is None else {"key": key, "value": value})
+                + b"\n"
+                for key, value in entries
+            )
+        )
+
     def get(self, key: str) -> Optional[Dict[str, Any]]:
-        data = self._read()
-        return data.get(key)
+        return self._data.get(key)
 
     def set(self, key: str, value: Dict[str, Any]) -> None:
-        data = self._read()
-        data[key] = value
-        self._write(data)
+        self._data[key] = value
+        self._log(((key, value),))
+        self.pending += 1
+
+    def set_bulk(self, values: Dict[str, Dict[str, Any]]) -> None:
+        self._data.update(values)
+        self._log(values.items())
+        self.pending += len(values)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The live in-memory mapping, for hot loops that look up many keys (do not mutate)."""
+        return self._data
 
     def exists(self, key: str) -> bool:
-        data = self._read()
-        return key in data
+        return key in self._data
 
     def delete(self, key: str) -> None:
-        data = self._read()
-        if key in data:
-            del data[key]
-            self._write(data)
+        if key in self._data:
+            del self._data[key]
+            self._log(((key, None),))
+            self.pending += 1
+
+    def flush(self) -> None:
+        """Write pending changes, if any, into the document and drop the WAL."""
+        if not self.pending:
+            return
+        self._write(self._data)
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        if os.path.exists(self.wal_path):
+            os.remove(self.wal_path)
+        self.pending = 0
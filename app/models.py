@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Any, Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class BotmakerChat:
     chat_id: str
     channel_id: str
@@ -49,8 +49,12 @@ class BotmakerChat:
             exported_at=item.get("exported_at"),
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow field -> value dict (models are flat, so dataclasses.asdict's deep copy is not needed)."""
+        return {name: getattr(self, name) for name in _CHAT_FIELDS}
 
-@dataclass
+
+@dataclass(slots=True)
 class BotmakerMessage:
     id: str
     creation_time: Optional[str]
@@ -82,3 +86,11 @@ class BotmakerMessage:
             exported_to_chatwoot=item.get("exported_to_chatwoot", False),
             exported_at=item.get("exported_at"),
         )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow field -> value dict; see ``BotmakerChat.to_dict``."""
+        return {name: getattr(self, name) for name in _MESSAGE_FIELDS}
+
+
+_CHAT_FIELDS = tuple(f.name for f in fields(BotmakerChat))
+_MESSAGE_FIELDS = tuple(f.name for f in fields(BotmakerMessage))
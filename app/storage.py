@@ -1,10 +1,41 @@
-import json
 import logging
 import os
 from typing import Iterable, Dict, Any
 
+from .utils import json_dumps, json_loads
+
 logger = logging.getLogger(__name__)
 
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+class NdjsonWriter:
+    """Write NDJSON records one at a time through a buffered binary file handle.
+
+    ``count`` tracks how many records were written, so callers need not keep them around to count.
+    """
+
+    def __init__(self, path: str, mode: str = "wb") -> None:
+        self.path = path
+        self.count = 0
+        # A large buffer turns many small record writes into few write(2) calls.
+        self._fh = open(path, mode, buffering=WRITE_BUFFER_SIZE)
+
+    def __enter__(self) -> "NdjsonWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def write(self, rec: Dict[str, Any]) -> None:
+        self._fh.write(json_dumps(rec) + b"\n")
+        self.count += 1
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self._fh.close()
+            logger.info("Wrote %s", self.path)
+
 
 class LocalStorage:
     def __init__(self, data_dir: str) -> None:
@@ -16,19 +47,21 @@ class LocalStorage:
         os.makedirs(os.path.dirname(path), exist_ok=True)
         return path
 
-    def write_ndjson(self, rel_path: str, records: Iterable[Dict[str, Any]]) -> None:
-        path = self._path(rel_path)
-        with open(path, "w", encoding="utf-8") as f:
+    def write_ndjson(self, rel_path: str, records: Iterable[Dict[str, Any]]) -> int:
+        with self.open_ndjson(rel_path) as writer:
             for rec in records:
-                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-        logger.info("Wrote %s", path)
+                writer.write(rec)
+        return writer.count
 
-    def append_ndjson(self, rel_path: str, records: Iterable[Dict[str, Any]]) -> None:
-        path = self._path(rel_path)
-        with open(path, "a", encoding="utf-8") as f:
+    def open_ndjson(self, rel_path: str, append: bool = False) -> NdjsonWriter:
+        """Open an NDJSON file for incremental writes (truncating any previous content unless ``append``)."""
+        return NdjsonWriter(self._path(rel_path), "ab" if append else "wb")
+
+    def append_ndjson(self, rel_path: str, records: Iterable[Dict[str, Any]]) -> int:
+        with self.open_ndjson(rel_path, append=True) as writer:
             for rec in records:
-                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-        logger.info("Appended %s", path)
+                writer.write(rec)
+        return writer.count
 
     def save_bytes(self, rel_path: str, content: bytes) -> None:
         path = self._path(rel_path)
@@ -41,12 +74,13 @@ class LocalStorage:
         if not os.path.exists(path):
             logger.warning("NDJSON not found: %s", path)
             return []
-        with open(path, "r", encoding="utf-8") as f:
+        # Raw lines go straight to the decoder (orjson when available), which skips the surrounding
+        # whitespace itself, so no decoded or stripped copy of each line is made.
+        with open(path, "rb") as f:
             for line in f:
-                line = line.strip()
-                if not line:
+                if line.isspace():
                     continue
-                yield json.loads(line)
+                yield json_loads(line)
 
     def iter_ndjson(self, rel_path: str) -> Iterable[Dict[str, Any]]:
         yield from self.read_ndjson(rel_path)
@@ -64,8 +98,8 @@ class LocalStorage:
     def write_json(self, rel_path: str, obj: Dict[str, Any]) -> None:
         path = self._path(rel_path)
         tmp = f"{path}.tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(obj, f, ensure_ascii=False, indent=2)
+        with open(tmp, "wb") as f:
+            f.write(json_dumps(obj, indent=True))
         os.replace(tmp, path)
         logger.info("Wrote %s", path)
 
@@ -74,8 +108,8 @@ class LocalStorage:
         if not os.path.exists(path):
             logger.warning("JSON not found: %s", path)
             return {}
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return json_loads(f.read())
 
 
 def make_storage(backend: str, data_dir: str) -> LocalStorage:
@@ -1,8 +1,39 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
 
 
 def iso_now() -> str:
     """Return current UTC timestamp as ISO-8601 string."""
     return datetime.now(timezone.utc).isoformat()
+
+
+def json_dumps(
+    obj: Any, *, indent: bool = False, default: Optional[Callable[[Any], Any]] = None
+) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes, using orjson when available.
+
+    ``default`` converts values neither encoder supports (orjson already handles datetimes).
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+    if indent:
+        return json.dumps(obj, default=default, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Decode JSON from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import logging
 import sys
 from http import HTTPStatus
 from pathlib import Path
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
-import json
 from datetime import date, datetime
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -14,16 +15,71 @@ if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
 from app.config import get_settings
-from app.extract import run_sample_extract
-from app.logging_setup import setup_logging
+from app.utils import json_dumps
+
+if TYPE_CHECKING:
+    import httpx
+
+# httpx, the API clients and the extractor are imported on first use: preflight and rejected
+# requests are answered without loading them, which keeps cold starts short.
 
 logger = logging.getLogger(__name__)
 
+# Warm invocations reuse the container: settings and logging are set up once per process.
+_SETTINGS = get_settings()
+_LOG_DIR: Optional[str] = None
+
+
+def _ensure_logging() -> str:
+    global _LOG_DIR
+    if _LOG_DIR is None:
+        from app.logging_setup import setup_logging
+
+        _LOG_DIR = setup_logging(_SETTINGS.log_dir)
+    return _LOG_DIR
+
+
+# The Botmaker connection pool also outlives a request. Its connections belong to the event loop
+# that opened them, so one long-lived runner is kept alongside it instead of asyncio.run per call.
+_RUNNER: Optional[asyncio.Runner] = None
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def _http_session() -> Tuple[asyncio.Runner, httpx.AsyncClient]:
+    global _RUNNER, _HTTP_CLIENT
+    if _RUNNER is None or _HTTP_CLIENT is None:
+        from app.http import make_shared_async_client
+
+        _RUNNER = asyncio.Runner()
+        _HTTP_CLIENT = make_shared_async_client()
+        atexit.register(_close_http_session)
+    return _RUNNER, _HTTP_CLIENT
+
+
+def _close_http_session() -> None:
+    global _RUNNER, _HTTP_CLIENT
+    if _RUNNER is not None and _HTTP_CLIENT is not None:
+        _RUNNER.run(_HTTP_CLIENT.aclose())
+        _RUNNER.close()
+    _RUNNER = _HTTP_CLIENT = None
+
+
+_ALLOWED_METHODS = frozenset(("GET", "POST"))
+# Shared by every response; the runtime only serializes it.
+_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
+}
+
 
 def _json_default(value: Any) -> Any:
-    if isinstance(value, (datetime, date)):
+    # Dates only reach this with the stdlib fallback; orjson encodes them natively. Exact type
+    # checks first, so the common cases skip the isinstance MRO walk.
+    kind = type(value)
+    if kind is datetime or kind is date or isinstance(value, date):
         return value.isoformat()
-    if isinstance(value, set):
+    if kind is set or isinstance(value, set):
         return list(value)
     return str(value)
 
@@ -31,12 +87,8 @@ def _json_default(value: Any) -> Any:
 def _json_response(status: int, payload: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "statusCode": status,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
-        },
-        "body": json.dumps(payload, default=_json_default, ensure_ascii=False),
+        "headers": _HEADERS,
+        "body": json_dumps(payload, default=_json_default).decode("utf-8"),
     }
 
 
@@ -46,10 +98,10 @@ def handler(event, context):  # noqa: D401 (Netlify signature)
     if method == "OPTIONS":
         return _json_response(HTTPStatus.NO_CONTENT, {})
 
-    if method not in {"GET", "POST"}:
+    if method not in _ALLOWED_METHODS:
         return _json_response(HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Method not allowed"})
 
-    settings = get_settings()
+    settings = _SETTINGS
 
     if not settings.botmaker_api_token:
         return _json_response(
@@ -60,9 +112,12 @@ def handler(event, context):  # noqa: D401 (Netlify signature)
             },
         )
 
-    resolved_log_dir = setup_logging(settings.log_dir)
+    from app.extract import run_sample_extract
+
+    resolved_log_dir = _ensure_logging()
     logger.info("Test run logging directory: %s", resolved_log_dir)
 
+    runner, http_client = _http_session()
     try:
         result = run_sample_extract(
             settings=settings,
@@ -70,6 +125,8 @@ def handler(event, context):  # noqa: D401 (Netlify signature)
             messages_per_chat=100,
             skip_messages=False,
             long_term=False,
+            client=http_client,
+            runner=runner,
         )
         return _json_response(HTTPStatus.OK, result)
     except ValueError as exc:
@@ -2,19 +2,25 @@
 from __future__ import annotations
 
 import argparse
-import subprocess
+import logging
 import sys
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 # Ensure we can import the local 'app' package when running from repo root
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
+from app.checkpoints import CheckpointStore  # noqa: E402
 from app.config import get_settings  # noqa: E402
+from app.extract import run as _run  # noqa: E402
+from app.logging_setup import setup_logging  # noqa: E402
+
+logger = logging.getLogger("extract_2025")
 
 
 @dataclass(frozen=True)
@@ -22,9 +28,16 @@ class Window:
     start: datetime
     end: datetime
     prefix: str
+    # Formatted once at construction; the plan and every run reuse them.
+    start_iso: str = field(init=False, repr=False, compare=False)
+    end_iso: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "start_iso", self.start.isoformat().replace("+00:00", "Z"))
+        object.__setattr__(self, "end_iso", self.end.isoformat().replace("+00:00", "Z"))
 
     def iso_bounds(self) -> Tuple[str, str]:
-        return (self.start.isoformat().replace("+00:00", "Z"), self.end.isoformat().replace("+00:00", "Z"))
+        return (self.start_iso, self.end_iso)
 
 
 def month_windows(year: int, root_prefix: str) -> List[Window]:
@@ -48,50 +61,44 @@ def biweekly_from_month(win: Window) -> List[Window]:
 
 
 def plan_text(windows: Iterable[Window]) -> str:
-    lines = ["Extraction plan:"]
-    for w in windows:
-        f, t = w.iso_bounds()
-        lines.append(f"- {f} -> {t}  |  prefix: {w.prefix}")
-    return "\n".join(lines)
+    body = [f"- {w.start_iso} -> {w.end_iso}  |  prefix: {w.prefix}" for w in windows]
+    return "Extraction plan:\n" + "\n".join(body)
 
 
-def run_extract(window: Window) -> int:
+def run_extract(window: Window, rps: Optional[float] = None, checkpoints: Optional[CheckpointStore] = None) -> int:
     f, t = window.iso_bounds()
-    cmd = [
-        sys.executable,
-        "-m",
-        "app.extract",
-        "--from",
-        f,
-        "--to",
-        t,
-        "--long-term",
-        "--output-prefix",
-        window.prefix,
-    ]
-    print(f"[RUN] {' '.join(cmd)}")
-    proc = subprocess.run(cmd, cwd=str(ROOT))
-    return proc.returncode
-
-
-def execute_with_fallback(windows: Iterable[Window]) -> int:
+    logger.info("Running window %s -> %s  |  prefix: %s", f, t, window.prefix)
+    return _run(f, t, True, window.prefix, rps=rps, checkpoints=checkpoints)
+
+
+def execute_with_fallback(windows: Iterable[Window], max_parallel: int = 1, rps: Optional[float] = None) -> int:
     """Execute monthly windows; on failure, split month into biweekly windows and try again.
+    Up to ``max_parallel`` months run at once, sharing the ``rps`` Botmaker quota between them.
     Returns the number of failures (0 if all good)."""
-    failures = 0
-    for w in windows:
-        rc = run_extract(w)
-        if rc == 0:
-            continue
-        print(f"[WARN] Monthly extraction failed for {w.prefix}. Trying biweekly fallback…")
+    # Each window rate-limits its own client, so the aggregate quota is split between them.
+    window_rps = rps / max_parallel if rps and max_parallel > 1 else rps
+    # One store for every window, so their checkpoint updates are serialized and written once.
+    checkpoints = CheckpointStore(get_settings().mappings_dir)
+
+    def run_month(w: Window) -> bool:
+        """Run a month, falling back to its biweekly halves right away; True when it failed."""
+        if run_extract(w, window_rps, checkpoints) == 0:
+            return False
+        logger.warning("Monthly extraction failed for %s. Trying biweekly fallback…", w.prefix)
         subfails = 0
         for bw in biweekly_from_month(w):
-            subrc = run_extract(bw)
+            subrc = run_extract(bw, window_rps, checkpoints)
             if subrc != 0:
-                print(f"[ERROR] Biweekly extraction failed for {bw.prefix} (rc={subrc})")
+                logger.error("Biweekly extraction failed for %s (rc=%s)", bw.prefix, subrc)
                 subfails += 1
-        if subfails:
-            failures += 1
-    return failures
+        return subfails > 0
+
+    # Months are independent and I/O-bound; each thread runs its own event loop.
+    try:
+        with ThreadPoolExecutor(max_workers=max(max_parallel, 1)) as pool:
+            return sum(pool.map(run_month, windows))
+    finally:
+        checkpoints.flush()
 
 
 def parse_args() -> argparse.Namespace:
@@ -107,28 +114,38 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Execute extraction (default: only print plan)",
     )
+    p.add_argument(
+        "--max-parallel",
+        type=int,
+        default=1,
+        help="Number of windows extracted at once; RATE_LIMIT_RPS is split between them (default: 1)",
+    )
     return p.parse_args()
 
 
 def main() -> None:
     args = parse_args()
     settings = get_settings()  # ensure .env is loaded
+    # Records are handed to a background listener, so parallel windows never block on console I/O.
+    setup_logging(settings.log_dir)
 
     wins = month_windows(args.year, args.root_prefix)
 
-    print(plan_text(wins))
-    print("\nNOTE: Each window runs with --long-term and no per-chat limits.")
-    print("      Data will be written under data/<prefix>/… as NDJSON + summary.json")
+    logger.info("%s", plan_text(wins))
+    logger.info(
+        "Each window runs with --long-term and no per-chat limits. "
+        "Data will be written under data/<prefix>/… as NDJSON + summary.json"
+    )
 
     if not args.execute:
-        print("\nPlan only (no execution). Use --execute to run.")
+        logger.info("Plan only (no execution). Use --execute to run.")
         return
 
-    failures = execute_with_fallback(wins)
+    failures = execute_with_fallback(wins, max_parallel=args.max_parallel, rps=settings.rate_limit_rps)
     if failures == 0:
-        print("\nAll windows completed successfully.")
+        logger.info("All windows completed successfully.")
     else:
-        print(f"\nCompleted with {failures} monthly windows failing even after biweekly fallback.")
+        logger.error("Completed with %d monthly windows failing even after biweekly fallback.", failures)
 
 
 if __name__ == "__main__":
@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 # make repo root importable
 ROOT = Path(__file__).resolve().parents[1]
@@ -15,9 +16,14 @@ from app.chatwoot import ChatwootClient  # noqa: E402
 from app.config import get_settings  # noqa: E402
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="List Chatwoot inboxes for an account")
-    parser.add_argument("--account-id", required=True, help="Chatwoot account ID")
+def _csv_row(inbox: Dict[str, Any], prefix: str = "") -> str:
+    get = inbox.get
+    return f"{prefix}{get('id')},{get('name')},{get('channel_type')},{get('website_url') or ''}\n"
+
+
+async def list_inboxes() -> None:
+    parser = argparse.ArgumentParser(description="List Chatwoot inboxes for one or more accounts")
+    parser.add_argument("--account-id", required=True, nargs="+", help="Chatwoot account ID(s)")
     args = parser.parse_args()
 
     settings = get_settings()
@@ -25,25 +31,37 @@ def main() -> None:
         print("ERROR: CHATWOOT_API_ACCESS_TOKEN is not set in environment (.env)")
         sys.exit(1)
 
-    client = ChatwootClient(
+    # One client, so every account is listed over the same warm connection. Every response is
+    # checked before anything is written, so a malformed one never follows a partial CSV.
+    inboxes: List[Tuple[str, List[Dict[str, Any]]]] = []
+    async with ChatwootClient(
         base_url=settings.chatwoot_base_url,
         api_access_token=settings.chatwoot_api_access_token,
         rps=settings.rate_limit_rps,
+    ) as client:
+        for account_id in args.account_id:
+            data: Dict[str, Any] = await client.list_inboxes(account_id)
+            items: List[Dict[str, Any]] = data if isinstance(data, list) else data.get("payload") or data.get("data") or data.get("items") or []
+            if not isinstance(items, list):
+                print("Unexpected response structure:")
+                print(data)
+                sys.exit(2)
+            inboxes.append((account_id, items))
+
+    # With several accounts the rows are told apart by a leading account_id column.
+    multiple = len(inboxes) > 1
+    header = "id,name,channel_type,website_url\n"
+    # Header and rows go out in one buffered write instead of a print per inbox.
+    sys.stdout.writelines(
+        [
+            f"account_id,{header}" if multiple else header,
+            *(_csv_row(inbox, f"{account_id}," if multiple else "") for account_id, items in inboxes for inbox in items),
+        ]
     )
-    try:
-        data: Dict[str, Any] = client.list_inboxes(args.account_id)
-        items: List[Dict[str, Any]] = data if isinstance(data, list) else data.get("payload") or data.get("data") or data.get("items") or []
-        if not isinstance(items, list):
-            print("Unexpected response structure:")
-            print(data)
-            sys.exit(2)
-        print("id,name,channel_type,website_url")
-        for inbox in items:
-            print(
-                f"{inbox.get('id')},{inbox.get('name')},{inbox.get('channel_type')},{inbox.get('website_url') or ''}"
-            )
-    finally:
-        client.close()
+
+
+def main() -> None:
+    asyncio.run(list_inboxes())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,21 @@
+import asyncio
+from typing import Callable, List
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def mock_client():
+    """Factory for an ``httpx.AsyncClient`` answering through ``handler``, injected via ``client=``."""
+    created: List[httpx.AsyncClient] = []
+
+    def make(handler: Callable[[httpx.Request], httpx.Response]) -> httpx.AsyncClient:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        created.append(client)
+        return client
+
+    yield make
+    for client in created:
+        if not client.is_closed:
+            asyncio.run(client.aclose())
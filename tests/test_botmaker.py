@@ -0,0 +1,24 @@
+import asyncio
+
+import httpx
+
+from app.botmaker import BotmakerClient, stream_messages
+
+
+def test_stream_messages_stops_paging_once_limit_is_reached(mock_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        items = [{"id": f"m{len(calls)}-{i}", "chat": {"chatId": "c1"}} for i in range(3)]
+        return httpx.Response(200, json={"items": items, "nextPage": "https://bm.test/v2.0/messages?page=next"})
+
+    async def scenario() -> list:
+        client = BotmakerClient("https://bm.test/v2.0", "token", rps=100, client=mock_client(handler))
+        try:
+            return [m.id async for m in stream_messages(client, chat_id="c1", limit=2)]
+        finally:
+            await client.close()
+
+    assert asyncio.run(scenario()) == ["m1-0", "m1-1"]
+    assert len(calls) == 1
@@ -0,0 +1,66 @@
+import asyncio
+
+import httpx
+
+from app.chatwoot import ChatwootClient
+
+
+def test_search_contacts_is_cached_until_a_contact_write(mock_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.method in ("POST", "PUT"):
+            return httpx.Response(200, json={"payload": {"contact": {"id": 1}}})
+        return httpx.Response(200, json={"payload": []})
+
+    async def scenario() -> None:
+        client = ChatwootClient("https://chatwoot.test", "token", rps=100, client=mock_client(handler))
+        try:
+            await client.search_contacts("1", "5511999999999")
+            await client.search_contacts("1", "5511999999999")
+            await client.create_contact("1", {"identifier": "5511999999999"})
+            await client.search_contacts("1", "5511999999999")
+            await client.search_contacts("1", "other@example.com")
+            await client.update_contact("1", 1, {"identifier": "5511999999999"})
+            await client.search_contacts("1", "other@example.com")
+        finally:
+            await client.close()
+
+    asyncio.run(scenario())
+    searches = [c for c in calls if c[1].endswith("/contacts/search")]
+    # The unrelated search survives the write to another contact.
+    assert len(searches) == 3
+
+
+def test_client_closes_its_pool_as_async_context_manager():
+    async def scenario() -> ChatwootClient:
+        async with ChatwootClient("https://chatwoot.test", "token", rps=100) as client:
+            assert not client.http.client.is_closed
+        return client
+
+    client = asyncio.run(scenario())
+    assert client.http.client.is_closed
+
+
+def test_search_finishing_during_a_contact_write_is_not_kept(mock_client):
+    searches = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            # The write is slower than the search that races with it.
+            await asyncio.sleep(0.02)
+            return httpx.Response(200, json={"payload": {"contact": {"id": 1}}})
+        searches.append(request.url.params["q"])
+        return httpx.Response(200, json={"payload": []})
+
+    async def scenario() -> None:
+        client = ChatwootClient("https://chatwoot.test", "token", rps=100, client=mock_client(handler))
+        await asyncio.gather(
+            client.create_contact("1", {"identifier": "5511999999999"}),
+            client.search_contacts("1", "5511999999999"),
+        )
+        await client.search_contacts("1", "5511999999999")
+
+    asyncio.run(scenario())
+    assert searches == ["5511999999999", "5511999999999"]
@@ -0,0 +1,36 @@
+import json
+from pathlib import Path
+
+from app.checkpoints import CheckpointStore
+
+
+def test_checkpoint_writes_are_deferred_until_flush(tmp_path: Path):
+    store = CheckpointStore(tmp_path.as_posix())
+    store.set("last_extract", {"from": "a", "to": "b"})
+    store.update({"other": 1})
+
+    on_disk = json.loads((tmp_path / "checkpoints.json").read_text(encoding="utf-8"))
+    assert on_disk == {}
+
+    store.flush()
+    reloaded = CheckpointStore(tmp_path.as_posix())
+    assert reloaded.get("last_extract") == {"from": "a", "to": "b"}
+    assert reloaded.get("other") == 1
+
+
+def test_checkpoint_context_manager_flushes(tmp_path: Path):
+    with CheckpointStore(tmp_path.as_posix(), filename="loader.json") as store:
+        store.set("last_load", {"ok": True})
+        store.delete("missing")
+
+    assert CheckpointStore(tmp_path.as_posix(), filename="loader.json").get("last_load") == {"ok": True}
+
+
+def test_checkpoint_set_latest_keeps_the_later_window(tmp_path: Path):
+    store = CheckpointStore(tmp_path.as_posix())
+    store.set_latest("last_extract", {"to": "2025-03-01T00:00:00Z"}, "to")
+    store.set_latest("last_extract", {"to": "2025-02-01T00:00:00Z"}, "to")
+    assert store.get("last_extract") == {"to": "2025-03-01T00:00:00Z"}
+
+    store.set_latest("last_extract", {"to": "2025-04-01T00:00:00Z"}, "to")
+    assert store.get("last_extract") == {"to": "2025-04-01T00:00:00Z"}
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import httpx
+
+from app.http import AsyncHttpClient, AsyncRateLimiter, _backoff_seconds
+
+
+def test_rate_limiter_allows_burst_then_throttles():
+    async def scenario() -> tuple[float, float]:
+        limiter = AsyncRateLimiter(rps=20)
+        start = time.monotonic()
+        for _ in range(20):
+            await limiter.acquire()
+        burst = time.monotonic() - start
+        await limiter.acquire()
+        return burst, time.monotonic() - start
+
+    burst, total = asyncio.run(scenario())
+    assert burst < 0.05
+    assert total >= 0.04
+
+
+def test_backoff_starts_at_half_a_second():
+    delays = [_backoff_seconds(attempt) for attempt in range(1, 5)]
+    for delay, base in zip(delays, (0.5, 1.0, 2.0, 4.0)):
+        assert base <= delay <= base + 0.25
+
+
+def test_request_retries_after_server_backoff(mock_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"ok": True})
+
+    async def scenario() -> httpx.Response:
+        client = AsyncHttpClient("https://example.test", rps=100, client=mock_client(handler))
+        try:
+            return await client.request("GET", "/chats")
+        finally:
+            await client.close()
+
+    resp = asyncio.run(scenario())
+    assert resp.status_code == 200
+    assert calls == ["/chats", "/chats"]
+
+
+def test_clients_share_an_injected_pool():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.host, request.url.path, request.headers.get("x-token")))
+        return httpx.Response(200, json={})
+
+    async def scenario() -> None:
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        botmaker = AsyncHttpClient("https://bm.test/v2.0", headers={"x-token": "a"}, rps=100, client=shared)
+        chatwoot = AsyncHttpClient("https://cw.test", headers={"x-token": "b"}, rps=100, client=shared)
+        try:
+            await botmaker.request("GET", "/chats")
+            await chatwoot.request("GET", "/api/v1/accounts/1/inboxes")
+            await botmaker.close()
+            assert not shared.is_closed
+        finally:
+            await shared.aclose()
+
+    asyncio.run(scenario())
+    assert seen == [
+        ("bm.test", "/v2.0/chats", "a"),
+        ("cw.test", "/api/v1/accounts/1/inboxes", "b"),
+    ]
@@ -0,0 +1,287 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app import load
+from app.config import Settings
+from app.load import (
+    ChatActivity,
+    _activity_attributes,
+    _extract_first_contact_id,
+    _sanitize_labels,
+    compute_interactions,
+    contact_payload,
+    determine_message_content,
+    message_payload,
+)
+from app.models import BotmakerMessage
+from app.storage import LocalStorage
+from app.utils import json_loads
+
+
+def _message(content):
+    return BotmakerMessage(
+        id="m1",
+        creation_time=None,
+        sender="user",
+        agent_id=None,
+        queue_id=None,
+        chat_id="c1",
+        channel_id="whatsapp",
+        contact_id="5511",
+        session_id=None,
+        content=content,
+    )
+
+
+def test_determine_message_content_by_type():
+    assert determine_message_content(_message({"type": "text", "text": "oi"})) == "oi"
+    assert determine_message_content(_message({"type": "buttons", "selectedButton": "Sim"})) == "[Button] Sim"
+    assert determine_message_content(_message({"type": "image", "media": {"url": "https://x/y.png"}})) == "[Image] https://x/y.png"
+    assert determine_message_content(_message({"type": "file", "media": {"size": 1}})) == "[File] binary"
+
+
+def test_determine_message_content_falls_back():
+    assert determine_message_content(_message({"type": "text", "text": "", "originalText": "orig"})) == "orig"
+    assert determine_message_content(_message({"type": "audio", "media": {}})) == "[audio message without text]"
+    assert determine_message_content(_message(None)) == "[unknown message without text]"
+    assert determine_message_content(_message({"type": ["text"], "originalText": "orig"})) == "orig"
+
+
+def test_message_payload_marks_agent_messages_public():
+    message = _message({"type": "text", "text": "oi"})
+    assert message_payload(message)["message_type"] == "incoming"
+    assert "private" not in message_payload(message)
+
+    message.sender = "agent"
+    payload = message_payload(message)
+    assert payload["message_type"] == "outgoing"
+    assert payload["private"] is False
+
+
+def test_message_payload_shapes_by_sender():
+    message = _message({"type": "text", "text": "oi"})
+    message.sender = "bot"
+    assert message_payload(message)["message_type"] == "outgoing"
+    assert "private" not in message_payload(message)
+
+    message.sender = "User"
+    assert message_payload(message)["message_type"] == "incoming"
+
+    message.sender = "Agent"
+    assert message_payload(message)["message_type"] == "outgoing"
+    assert "private" not in message_payload(message)
+
+
+def test_contact_payload_skips_empty_fields():
+    payload = contact_payload({"contact_id": "5511999", "first_name": "Ana", "email": "", "tags": ["vip"]})
+
+    assert list(payload) == ["name", "identifier", "phone_number", "custom_attributes"]
+    assert payload["name"] == "Ana"
+    assert payload["phone_number"] == "+5511999"
+    assert payload["custom_attributes"]["botmaker_tags"] == ["vip"]
+    assert payload["custom_attributes"]["botmaker_chat_id"] is None
+
+
+def test_contact_payload_only_uses_ascii_digit_ids_as_phone():
+    assert "phone_number" not in contact_payload({"contact_id": "5511²"})
+    assert "phone_number" not in contact_payload({"contact_id": "+5511999"})
+    assert "phone_number" not in contact_payload({"contact_id": 5511999})
+
+
+def test_compute_interactions_keeps_latest_timestamp():
+    messages = [
+        {"chat_id": "c1", "contact_id": "k1", "creation_time": "2025-01-02T10:00:00Z"},
+        {"chat_id": "c1", "contact_id": "k1", "creation_time": "2025-01-01T10:00:00+00:00"},
+        {"chat_id": "c2", "contact_id": "k1", "creation_time": "2025-01-03T10:00:00Z"},
+        {"chat_id": "c2", "contact_id": "k1", "creation_time": "2025-01-03T09:00:00.5-03:00"},
+    ]
+    chat_last, contact_last, _, _ = compute_interactions([], messages)
+
+    assert chat_last == {"c1": "2025-01-02T10:00:00Z", "c2": "2025-01-03T09:00:00.5-03:00"}
+    assert contact_last == {"k1": "2025-01-03T09:00:00.5-03:00"}
+
+
+def test_extract_first_contact_id_walks_nested_shapes():
+    assert _extract_first_contact_id({"payload": [{"id": "x"}, {"contact": {"id": 7}}, {"id": 8}]}) == 7
+    assert _extract_first_contact_id({"data": {"payload": []}, "results": [{"id": 3}]}) == 3
+    assert _extract_first_contact_id([{"name": "n"}, None]) is None
+
+
+def test_sanitize_labels_dedups_case_insensitively():
+    assert _sanitize_labels(["VIP", " vip ", None, "", 7, "Lead"]) == ["VIP", "7", "Lead"]
+    assert _sanitize_labels("vip") == []
+    assert _sanitize_labels(["vip", {"nested": 1}]) == ["vip", "{'nested': 1}"]
+    assert _sanitize_labels([1]) == ["1"]
+    assert _sanitize_labels([True]) == ["True"]
+    assert _sanitize_labels([1.0]) == ["1.0"]
+
+
+def test_activity_attributes_only_include_known_values():
+    activity = ChatActivity("2025-01-02T10:00:00Z", False, None, None)
+
+    assert _activity_attributes(activity) == {"whatsapp": False, "data_ultima_interacao": "2025-01-02"}
+    assert _activity_attributes(ChatActivity(None, None, "ag", None)) == {"ultimo_atendente": "ag"}
+
+
+def _write_ndjson(path, records):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+
+def _read_ndjson(path):
+    return [json_loads(line) for line in path.read_bytes().splitlines()]
+
+
+@pytest.fixture
+def load_run(tmp_path, monkeypatch, mock_client):
+    """Run ``run_load`` over a small export in ``tmp_path`` against a Chatwoot mock.
+
+    Returns ``(run, data_dir, mappings_dir)``; ``run(handler, **args)`` loads the ``run`` prefix.
+    """
+    settings = Settings(
+        chatwoot_api_access_token="token",
+        chatwoot_account_id="1",
+        chatwoot_inbox_id="2",
+        storage_backend="local",
+        data_dir=str(tmp_path / "data"),
+        log_dir=str(tmp_path / "logs"),
+        mappings_dir=str(tmp_path / "mappings"),
+        rate_limit_rps=1000.0,
+        load_concurrency=2,
+    )
+    monkeypatch.setattr(load, "get_settings", lambda: settings)
+    data_dir = tmp_path / "data" / "run"
+    _write_ndjson(data_dir / "contacts.ndjson", [{"contact_id": f"k{i}"} for i in range(4)])
+    _write_ndjson(
+        data_dir / "chats.ndjson",
+        [{"chat_id": f"c{i}", "channel_id": "web", "contact_id": f"k{i % 4}"} for i in range(6)],
+    )
+    _write_ndjson(
+        data_dir / "messages.ndjson",
+        [
+            {
+                "id": f"m{i}",
+                "creation_time": "2025-01-01T10:00:00Z",
+                "sender": "user",
+                "agent_id": None,
+                "queue_id": None,
+                "chat_id": f"c{i % 6}",
+                "channel_id": "web",
+                "contact_id": f"k{i % 4}",
+                "session_id": None,
+                "content": {"type": "text", "text": f"msg {i}"},
+            }
+            for i in range(12)
+        ],
+    )
+
+    def run(handler, **overrides):
+        monkeypatch.setattr(load, "make_shared_async_client", lambda: mock_client(handler))
+        args = SimpleNamespace(
+            input_prefix="run",
+            dry_run=False,
+            limit_chats=None,
+            limit_messages=None,
+            chunk_size=2,
+            skip_messages=False,
+            skip_conversations=False,
+            reset_checkpoint=False,
+        )
+        for key, value in overrides.items():
+            setattr(args, key, value)
+        asyncio.run(load.run_load(args))
+
+    return run, data_dir, tmp_path / "mappings"
+
+
+def _chatwoot_handler(calls, fail=None):
+    ids = iter(range(100, 10_000))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if fail is not None and fail(request):
+            raise RuntimeError("connection lost")
+        if request.method == "GET":
+            return httpx.Response(200, json={"payload": []})
+        return httpx.Response(200, json={"id": next(ids)})
+
+    return handler
+
+
+def test_run_load_resumes_an_interrupted_phase(load_run):
+    run, data_dir, mappings_dir = load_run
+    first_calls = []
+    # c4 opens the third chats chunk (chunk_size=2); its contact is k0, Chatwoot contact 100.
+    created = []
+
+    def second_conversation_of_k0(request):
+        if request.method == "POST" and request.url.path.endswith("/conversations"):
+            created.append(json_loads(request.content)["contact_id"])
+            return created.count(100) == 2
+        return False
+
+    with pytest.raises(Exception):
+        run(_chatwoot_handler(first_calls, fail=second_conversation_of_k0))
+
+    progress = json_loads((mappings_dir / "loader_checkpoint.json").read_bytes())["load_progress"]
+    assert progress["phase"] == "chats"
+    assert progress["offset"] == 4
+    assert progress["counts"] == {"contacts": 4, "chats": 4}
+    assert len(_read_ndjson(data_dir / "chats_export_status.ndjson")) == 4
+    # Conversations already in flight when c4 failed were allowed to finish and were mapped.
+    mapped = set(json_loads((mappings_dir / "conversation_map.json").read_bytes()))
+    assert {"c0", "c1", "c2", "c3"} <= mapped and "c4" not in mapped
+    assert len(mapped) == len(created) - 1
+
+    second_calls = []
+    run(_chatwoot_handler(second_calls))
+
+    # Contacts and the first two chats chunks are not sent again.
+    assert not [c for c in second_calls if c == ("POST", "/api/v1/accounts/1/contacts")]
+    # Only the failed conversation is sent twice over both runs.
+    assert len([c for c in second_calls if c[1].endswith("/conversations")]) == 6 - len(mapped)
+    # The status files of the interrupted run are appended to, not truncated.
+    assert len(_read_ndjson(data_dir / "contacts_export_status.ndjson")) == 4
+    assert [r["chat_id"] for r in _read_ndjson(data_dir / "chats_export_status.ndjson")] == [
+        f"c{i}" for i in range(6)
+    ]
+    summary = json_loads((data_dir / "load_summary.json").read_bytes())
+    assert summary["counts"] == {"contacts_updated": 4, "chats_updated": 6, "messages_updated": 12}
+    checkpoint = json_loads((mappings_dir / "loader_checkpoint.json").read_bytes())
+    assert "load_progress" not in checkpoint
+    assert checkpoint["last_load"]["chats_processed"] == 6
+
+
+def test_run_load_streams_messages_in_bounded_slices(load_run, monkeypatch):
+    run, data_dir, _ = load_run
+    read = {"messages": 0}
+    original = LocalStorage.read_ndjson
+
+    def counting_read(self, rel_path):
+        if not rel_path.endswith("/messages.ndjson"):
+            yield from original(self, rel_path)
+            return
+        read["messages"] = 0
+        for record in original(self, rel_path):
+            read["messages"] += 1
+            yield record
+
+    monkeypatch.setattr(LocalStorage, "read_ndjson", counting_read)
+    posted = []
+
+    def record_read_ahead(request):
+        if request.url.path.endswith("/messages"):
+            text = json_loads(request.content)["content"]
+            if text.startswith("msg "):
+                posted.append((int(text[4:]), read["messages"]))
+        return False
+
+    run(_chatwoot_handler([], fail=record_read_ahead))
+
+    assert sorted(index for index, _ in posted) == list(range(12))
+    # With chunk_size=2 no more than two slices are read ahead of the message being sent.
+    assert max(read_so_far - index for index, read_so_far in posted) <= 4
@@ -0,0 +1,14 @@
+import logging
+from pathlib import Path
+
+from app.logging_setup import setup_logging, stop_logging
+
+
+def test_records_reach_the_log_file_through_the_queue(tmp_path: Path):
+    log_dir = setup_logging(tmp_path.as_posix())
+    try:
+        logging.getLogger("app.test").info("queued record")
+    finally:
+        stop_logging()
+
+    assert "queued record" in (Path(log_dir) / "app.log").read_text(encoding="utf-8")
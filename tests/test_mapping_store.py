@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+
+from app.mapping_store import MappingStore
+
+
+def test_mapping_writes_are_batched_until_flush(tmp_path: Path):
+    store = MappingStore(tmp_path.as_posix(), "contact_map.json")
+    store.set("5511", {"chatwoot_contact_id": 1})
+    store.set_bulk({"5512": {"chatwoot_contact_id": 2}, "5513": {"chatwoot_contact_id": 3}})
+
+    assert store.get("5512") == {"chatwoot_contact_id": 2}
+    assert json.loads((tmp_path / "contact_map.json").read_text(encoding="utf-8")) == {}
+
+    store.flush()
+    reloaded = MappingStore(tmp_path.as_posix(), "contact_map.json")
+    assert reloaded.exists("5511")
+    assert reloaded.get("5513") == {"chatwoot_contact_id": 3}
+    assert reloaded.pending == 0
+
+
+def test_unflushed_changes_are_replayed_from_the_wal(tmp_path: Path):
+    store = MappingStore(tmp_path.as_posix(), "message_map.json")
+    store.set("m1", {"chatwoot_message_id": 1})
+    store.set("m2", {"chatwoot_message_id": 2})
+    store.delete("m1")
+    with open(store.wal_path, "ab") as fh:
+        fh.write(b'{"key": "m3", "val')  # torn write from a crash
+
+    recovered = MappingStore(tmp_path.as_posix(), "message_map.json")
+    assert not recovered.exists("m1")
+    assert recovered.get("m2") == {"chatwoot_message_id": 2}
+    assert recovered.pending == 3
+
+    recovered.flush()
+    assert not (tmp_path / "message_map.json.wal").exists()
+    assert json.loads((tmp_path / "message_map.json").read_text(encoding="utf-8")) == {"m2": {"chatwoot_message_id": 2}}
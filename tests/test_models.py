@@ -0,0 +1,25 @@
+from dataclasses import asdict
+
+from app.models import BotmakerChat, BotmakerMessage
+
+
+def test_to_dict_matches_asdict():
+    chat = BotmakerChat.from_api(
+        {
+            "chat": {"chatId": "c1", "channelId": "whatsapp-1", "contactId": "5511999999999"},
+            "firstName": "Ana",
+            "tags": ["vip"],
+            "variables": {"city": "SP"},
+        }
+    )
+    message = BotmakerMessage.from_api(
+        {
+            "id": "m1",
+            "from": "user",
+            "chat": {"chatId": "c1", "channelId": "whatsapp-1", "contactId": "5511999999999"},
+            "content": {"type": "text", "text": "oi"},
+        }
+    )
+
+    assert chat.to_dict() == asdict(chat)
+    assert message.to_dict() == asdict(message)
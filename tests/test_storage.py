@@ -8,7 +8,7 @@ def test_write_and_read_ndjson(tmp_path: Path):
     rel_path = "example/data.ndjson"
     records = [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}]
 
-    storage.write_ndjson(rel_path, records)
+    assert storage.write_ndjson(rel_path, iter(records)) == 2
     loaded = list(storage.read_ndjson(rel_path))
 
     assert loaded == records
@@ -22,3 +22,10 @@ def test_append_ndjson(tmp_path: Path):
 
     loaded = list(storage.read_ndjson(rel_path))
     assert loaded == [{"id": 1}, {"id": 2}]
+
+
+def test_read_ndjson_skips_blank_lines(tmp_path: Path):
+    storage = LocalStorage(tmp_path.as_posix())
+    (tmp_path / "data.ndjson").write_bytes(b'{"id": 1}\r\n\n  \n{"id": 2}')
+
+    assert list(storage.read_ndjson("data.ndjson")) == [{"id": 1}, {"id": 2}]